@@ -1,7 +1,11 @@
-from flask import Blueprint, render_template, request, redirect, url_for, session, flash, jsonify, send_file, make_response, current_app, g
+from flask import Blueprint, render_template, request, redirect, url_for, session, flash, jsonify, send_file, make_response, current_app, g, abort, Response, stream_with_context
 from flask_mail import Message
+from flask_caching import Cache
+from flask.json.provider import DefaultJSONProvider
 from datetime import datetime, timedelta
-import secrets
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
+from jinja2 import FileSystemBytecodeCache
 import os
 from werkzeug.security import generate_password_hash, check_password_hash
 import uuid
@@ -11,10 +15,43 @@ import json
 import io
 import csv
 import base64
+import threading
+import traceback
+from itertools import islice
+import hmac
+import smtplib
+import orjson
+from sqlalchemy import event, func, literal, or_, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, load_only, selectinload
 
 # Create admin blueprint
 admin_app = Blueprint('admin_app', __name__, template_folder='admin_templates', static_folder='static', url_prefix='/pravo')
 
+# Cache shared by admin views (bound to the main app in init_admin_app)
+cache = Cache()
+
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson; dates, UUIDs etc. still go through Flask's default()"""
+    option = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self.option).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        # Hooks such as the session serializer's object_hook need the stdlib decoder
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+# Background workers for outgoing email so SMTP latency stays off the request path
+email_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='admin-mail')
+EMAIL_MAX_ATTEMPTS = 3
+EMAIL_RETRY_DELAY = 30  # Seconds, multiplied by the attempt number
+
+# Public address of the main app, used for invitation links
+MAIN_APP_URL = os.environ.get('MAIN_APP_URL', 'https://asistentica.online')
+
 # Import database models and extensions (will be set from main app)
 db = None
 mail = None
@@ -25,10 +62,11 @@ AssessmentParticipant = None
 Question = None
 Invitation = None
 AssessmentResponse = None
+EmailVerification = None
 
 def init_admin_app(app, database, mail_ext, models):
     """Initialize admin app with main app dependencies"""
-    global db, mail, Company, User, Assessment, AssessmentParticipant, Question, Invitation, AssessmentResponse
+    global db, mail, Company, User, Assessment, AssessmentParticipant, Question, Invitation, AssessmentResponse, EmailVerification
     
     db = database
     mail = mail_ext
@@ -39,6 +77,28 @@ def init_admin_app(app, database, mail_ext, models):
     Question = models['Question']
     Invitation = models['Invitation']
     AssessmentResponse = models['AssessmentResponse']
+    EmailVerification = models['EmailVerification']
+    
+    cache.init_app(app)
+    app.json = ORJSONProvider(app)
+    
+    # Development guardrail - report every lazy relationship load so N+1
+    # regressions show up while working on a view, not in production latency
+    if app.debug or os.environ.get('FLASK_ENV') == 'development':
+        event.listen(db.session, 'do_orm_execute', report_lazy_load)
+    
+    # Reuse compiled template bytecode across renders and worker restarts. The
+    # cache holds marshalled code, so it must live in a directory only we can
+    # write: Jinja's default is a private per-user temp dir (0700, owner checked)
+    jinja_cache_dir = os.environ.get('JINJA_CACHE_DIR')
+    if jinja_cache_dir:
+        os.makedirs(jinja_cache_dir, mode=0o700, exist_ok=True)
+        cache_dir_stat = os.stat(jinja_cache_dir)
+        if cache_dir_stat.st_uid != os.getuid() or cache_dir_stat.st_mode & 0o022:
+            raise RuntimeError(f"JINJA_CACHE_DIR {jinja_cache_dir} must be owned by this user and not group/world writable")
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(jinja_cache_dir)
+    else:
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
     
     # Add custom Jinja2 functions to main app
     @app.template_global()
@@ -53,9 +113,222 @@ def init_admin_app(app, database, mail_ext, models):
             return ""
         return dt.strftime(format)
 
+    @app.template_filter('fromjson')
+    def fromjson_filter(value):
+        """Decode a JSON text column such as Question.options"""
+        return orjson.loads(value) if value else None
+
 # Admin credentials
 ADMIN_USERNAME = "admin"
 ADMIN_PASSWORD = "admin123"
+# Hash once at import so login never compares the plaintext directly; a
+# precomputed ADMIN_PASSWORD_HASH skips the KDF at every worker start
+ADMIN_PASSWORD_HASH = os.environ.get('ADMIN_PASSWORD_HASH') or generate_password_hash(ADMIN_PASSWORD)
+
+# Dashboard statistics - admins don't need second-accurate counts, so a short
+# TTL keeps six full-table COUNTs off every dashboard load
+@cache.memoize(timeout=45)
+def get_dashboard_stats():
+    # One SELECT of scalar subqueries instead of six separate round-trips
+    stmt = select(
+        select(func.count(Company.id)).scalar_subquery().label('total_companies'),
+        select(func.count(User.id)).scalar_subquery().label('total_users'),
+        select(func.count(Assessment.id)).scalar_subquery().label('total_assessments'),
+        select(func.count(Assessment.id)).where(Assessment.is_active == True).scalar_subquery().label('active_assessments'),
+        select(func.count(AssessmentResponse.id)).scalar_subquery().label('total_responses'),
+        select(func.count(Invitation.id)).where(Invitation.is_completed == False).scalar_subquery().label('pending_invitations'),
+    )
+    return dict(db.session.execute(stmt).one()._mapping)
+
+# Dashboard "recent" widgets - selected as plain rows so they can be cached
+# alongside the statistics instead of hitting five tables on every load
+@cache.memoize(timeout=45)
+def get_dashboard_recent(limit=5):
+    def rows(stmt):
+        return [row._asdict() for row in db.session.execute(stmt.limit(limit))]
+    
+    user_count = select(func.count(User.id)).where(User.company_id == Company.id).scalar_subquery()
+    assessment_count = select(func.count(Assessment.id)).where(Assessment.company_id == Company.id).scalar_subquery()
+    return {
+        'recent_companies': rows(select(
+            Company.name, Company.is_active, user_count.label('user_count'), assessment_count.label('assessment_count')
+        ).order_by(Company.created_at.desc())),
+        'recent_users': rows(select(
+            User.name, User.email, Company.name.label('company'), User.role, User.is_active
+        ).outerjoin(User.company_ref).order_by(User.created_at.desc())),
+        'recent_assessments': rows(select(
+            Assessment.title, Assessment.created_at, Assessment.is_active
+        ).order_by(Assessment.created_at.desc())),
+        'recent_responses': rows(select(AssessmentResponse.submitted_at).order_by(AssessmentResponse.submitted_at.desc())),
+    }
+
+# Row totals shown above the admin list pages
+@cache.memoize(timeout=300)
+def count_listing(kind, company_id=None):
+    model = {'companies': Company, 'users': User, 'assessments': Assessment}[kind]
+    query = model.query
+    if company_id:
+        query = query.filter_by(company_id=company_id)
+    return query.count()
+
+# Template questions (assessment_id = 0) are seeded reference data that the
+# admin never edits, so their grouping can be cached for a long time
+@cache.memoize(timeout=3600)
+def get_template_question_groups(language):
+    """Template questions grouped by category, keeping order within each group"""
+    rows = db.session.execute(
+        select(Question.id, Question.question_text, Question.question_group, Question.question_type, Question.order)
+        .where(Question.assessment_id == 0, Question.language == language)
+        .order_by(Question.order)
+    ).all()
+    
+    groups = {}
+    for row in rows:
+        groups.setdefault(row.question_group, []).append(row._asdict())
+    return groups
+
+# Active users of a company, used by the participant forms and the company users API
+@cache.memoize(timeout=60)
+def get_company_users(company_id):
+    rows = db.session.execute(
+        select(User.id, User.name, User.email, User.role, User.is_active)
+        .where(User.company_id == company_id, User.is_active == True)
+    ).all()
+    return [row._asdict() for row in rows]
+
+def count_by(column):
+    """Row counts per value of a foreign key column, as a dict"""
+    return dict(db.session.execute(select(column, func.count()).group_by(column)).all())
+
+# Completion and user activity figures for the reports page, kept as plain
+# rows so repeated refreshes within a minute are served from the cache
+@cache.memoize(timeout=60)
+def get_report_stats():
+    invitation_counts = count_by(Invitation.assessment_id)
+    response_counts = count_by(AssessmentResponse.assessment_id)
+    assessments = db.session.execute(
+        select(Assessment.id, Assessment.title, Assessment.created_at, Assessment.is_self_assessment,
+               User.name.label('creator_name'))
+        .join(User, Assessment.creator_id == User.id)
+    ).all()
+    
+    # Assessment completion rates
+    assessments_with_stats = []
+    for assessment in assessments:
+        total_invitations = invitation_counts.get(assessment.id, 0)
+        completed_responses = response_counts.get(assessment.id, 0)
+        completion_rate = (completed_responses / total_invitations * 100) if total_invitations > 0 else 0
+        
+        assessments_with_stats.append({
+            'assessment': assessment._asdict(),
+            'total_invitations': total_invitations,
+            'completed_responses': completed_responses,
+            'completion_rate': round(completion_rate, 1)
+        })
+    
+    # User activity stats
+    created_counts = count_by(Assessment.creator_id)
+    submitted_counts = count_by(AssessmentResponse.user_id)
+    sent_counts = count_by(Invitation.sender_id)
+    users = db.session.execute(
+        select(User.id, User.name, User.email, Company.name.label('company'), User.role).outerjoin(User.company_ref)
+    ).all()
+    
+    user_stats = []
+    for user in users:
+        user_stats.append({
+            'user': user._asdict(),
+            'assessments_created': created_counts.get(user.id, 0),
+            'responses_submitted': submitted_counts.get(user.id, 0),
+            'invitations_sent': sent_counts.get(user.id, 0)
+        })
+    
+    return {'assessments_with_stats': assessments_with_stats, 'user_stats': user_stats}
+
+def invalidate_admin_caches():
+    cache.delete_memoized(get_dashboard_stats)
+    cache.delete_memoized(get_dashboard_recent)
+    cache.delete_memoized(count_listing)
+    cache.delete_memoized(get_company_users)
+    cache.delete_memoized(get_report_stats)
+    cache.delete_memoized(get_all_data_summary)
+    # Cached assessment exports embed user, company and assessment names, so
+    # any admin edit moves them all to a fresh key
+    cache.set(EXPORT_CACHE_VERSION_KEY, uuid.uuid4().hex, timeout=0)
+
+# Company names and user emails are unique in the schema, so creates just
+# insert and let the constraint reject duplicates - one round-trip, and no
+# window for two concurrent requests to both pass a SELECT check
+def commit_unique():
+    """Commit the pending insert; False (and rolled back) if it hit a unique constraint"""
+    try:
+        db.session.commit()
+    except IntegrityError as e:
+        db.session.rollback()
+        # Other violations (e.g. a foreign key) are real errors, not duplicates;
+        # 23505 is Postgres' unique_violation, SQLite only reports it in the message
+        if getattr(e.orig, 'pgcode', None) != '23505' and 'UNIQUE constraint failed' not in str(e.orig):
+            raise
+        return False
+    return True
+
+def active_companies():
+    """Active companies for form dropdowns, loaded at most once per request"""
+    if 'active_companies' not in g:
+        g.active_companies = Company.query.filter_by(is_active=True).all()
+    return g.active_companies
+
+def active_users():
+    """Active users for form dropdowns, loaded at most once per request"""
+    if 'active_users' not in g:
+        g.active_users = User.query.filter_by(is_active=True).all()
+    return g.active_users
+
+def generate_tokens(count, nbytes=32):
+    """Generate count URL-safe tokens (same format as secrets.token_urlsafe) from one urandom read"""
+    raw = os.urandom(count * nbytes)
+    return [base64.urlsafe_b64encode(raw[i * nbytes:(i + 1) * nbytes]).rstrip(b'=').decode('ascii')
+            for i in range(count)]
+
+def keyset_paginate(query, model, per_page=20, total=None):
+    """Return a newest-first page of query, seeking past the ?after=<created_at>,<id> cursor.
+    
+    Unlike paginate() this needs no COUNT and no OFFSET, so every page costs the same.
+    """
+    cursor = None
+    after = request.args.get('after', '')
+    if after:
+        created_at, _, row_id = after.rpartition(',')
+        try:
+            cursor = (datetime.fromisoformat(created_at), int(row_id))
+        except ValueError:
+            cursor = None  # Malformed cursor - start from the newest rows
+    
+    if cursor:
+        query = query.filter(tuple_(model.created_at, model.id) < cursor)
+    rows = query.order_by(model.created_at.desc(), model.id.desc()).limit(per_page + 1).all()
+    
+    items = rows[:per_page]
+    has_next = len(rows) > per_page
+    next_cursor = f"{items[-1].created_at.isoformat()},{items[-1].id}" if has_next else None
+    return SimpleNamespace(items=items, total=total, has_prev=cursor is not None,
+                           has_next=has_next, next_cursor=next_cursor)
+
+def report_lazy_load(orm_execute_state):
+    """Log a lazy load with the project line that triggered it; LAZY_LOAD_RAISE=true makes it an error"""
+    if not orm_execute_state.is_select or orm_execute_state.lazy_loaded_from is None:
+        return
+    
+    relationship = orm_execute_state.loader_strategy_path[-1] if orm_execute_state.loader_strategy_path else '?'
+    root = current_app.root_path
+    caller = next((frame for frame in reversed(traceback.extract_stack()[:-1])
+                   if frame.filename.startswith(root) and 'site-packages' not in frame.filename), None)
+    location = f"{os.path.relpath(caller.filename, root)}:{caller.lineno}" if caller else 'unknown location'
+    message = f"Lazy load of {relationship} at {location}"
+    
+    if os.environ.get('LAZY_LOAD_RAISE', 'false').lower() == 'true':
+        raise RuntimeError(message)
+    current_app.logger.warning(message)
 
 # Admin authentication decorator
 def admin_required(f):
@@ -75,10 +348,12 @@ def admin_index():
 @admin_app.route('/login', methods=['GET', 'POST'])
 def admin_login():
     if request.method == 'POST':
-        username = request.form.get('username')
-        password = request.form.get('password')
+        username = request.form.get('username', '')
+        password = request.form.get('password', '')
         
-        if username == ADMIN_USERNAME and password == ADMIN_PASSWORD:
+        # Constant-time username check; password verified against the stored hash
+        username_ok = hmac.compare_digest(username.encode('utf-8'), ADMIN_USERNAME.encode('utf-8'))
+        if username_ok and check_password_hash(ADMIN_PASSWORD_HASH, password):
             session['admin_logged_in'] = True
             session['admin_username'] = username
             flash('Successfully logged in as admin!', 'success')
@@ -98,38 +373,17 @@ def admin_logout():
 @admin_app.route('/dashboard')
 @admin_required
 def admin_dashboard():
-    # Get statistics
-    total_companies = Company.query.count()
-    total_users = User.query.count()
-    total_assessments = Assessment.query.count()
-    active_assessments = Assessment.query.filter_by(is_active=True).count()
-    total_responses = AssessmentResponse.query.count()
-    pending_invitations = Invitation.query.filter_by(is_completed=False).count()
-    
-    # Recent activity
-    recent_companies = Company.query.order_by(Company.created_at.desc()).limit(5).all()
-    recent_users = User.query.order_by(User.created_at.desc()).limit(5).all()
-    recent_assessments = Assessment.query.order_by(Assessment.created_at.desc()).limit(5).all()
-    recent_responses = AssessmentResponse.query.order_by(AssessmentResponse.submitted_at.desc()).limit(5).all()
-    
-    return render_template('admin_dashboard.html',
-                         total_companies=total_companies,
-                         total_users=total_users,
-                         total_assessments=total_assessments,
-                         active_assessments=active_assessments,
-                         total_responses=total_responses,
-                         pending_invitations=pending_invitations,
-                         recent_companies=recent_companies,
-                         recent_users=recent_users,
-                         recent_assessments=recent_assessments,
-                         recent_responses=recent_responses)
+    # Statistics and recent activity both come from the short-lived cache
+    return render_template('admin_dashboard.html', **get_dashboard_recent(), **get_dashboard_stats())
 
 @admin_app.route('/companies')
 @admin_required
 def admin_companies():
-    page = request.args.get('page', 1, type=int)
-    companies = Company.query.order_by(Company.created_at.desc()).paginate(
-        page=page, per_page=20, error_out=False)
+    # The list only shows how many users and assessments each company has
+    companies = keyset_paginate(Company.query.options(
+        selectinload(Company.users).load_only(User.id),
+        selectinload(Company.assessments).load_only(Assessment.id)
+    ), Company)
     return render_template('admin_companies.html', companies=companies)
 
 @admin_app.route('/companies/create', methods=['GET', 'POST'])
@@ -144,16 +398,13 @@ def admin_create_company():
             flash('Company name is required!', 'error')
             return render_template('admin_create_company.html')
         
-        # Check if company already exists
-        existing_company = Company.query.filter_by(name=name).first()
-        if existing_company:
-            flash('Company with this name already exists!', 'error')
-            return render_template('admin_create_company.html')
-        
         # Create new company
         company = Company(name=name, description=description, industry=industry)
         db.session.add(company)
-        db.session.commit()
+        if not commit_unique():
+            flash('Company with this name already exists!', 'error')
+            return render_template('admin_create_company.html')
+        invalidate_admin_caches()
         
         flash(f'Company "{name}" created successfully!', 'success')
         return redirect(url_for('admin_app.admin_companies'))
@@ -172,6 +423,7 @@ def admin_edit_company(company_id):
         company.is_active = 'is_active' in request.form
         
         db.session.commit()
+        invalidate_admin_caches()
         flash(f'Company "{company.name}" updated successfully!', 'success')
         return redirect(url_for('admin_app.admin_companies'))
     
@@ -182,14 +434,19 @@ def admin_edit_company(company_id):
 def admin_delete_company(company_id):
     company = Company.query.get_or_404(company_id)
     
-    # Check if company has users or assessments
-    if company.users or company.assessments:
+    # Check if company has users or assessments without loading them
+    has_users, has_assessments = db.session.execute(select(
+        select(User.id).where(User.company_id == company_id).exists(),
+        select(Assessment.id).where(Assessment.company_id == company_id).exists()
+    )).one()
+    if has_users or has_assessments:
         flash('Cannot delete company with existing users or assessments!', 'error')
         return redirect(url_for('admin_app.admin_companies'))
     
     name = company.name
     db.session.delete(company)
     db.session.commit()
+    invalidate_admin_caches()
     
     flash(f'Company "{name}" deleted successfully!', 'success')
     return redirect(url_for('admin_app.admin_companies'))
@@ -197,18 +454,16 @@ def admin_delete_company(company_id):
 @admin_app.route('/users')
 @admin_required
 def admin_users():
-    page = request.args.get('page', 1, type=int)
     company_id = request.args.get('company_id', type=int)
     
-    query = User.query
+    query = User.query.options(joinedload(User.company_ref).load_only(Company.name))
     if company_id:
         query = query.filter_by(company_id=company_id)
     
-    users = query.order_by(User.created_at.desc()).paginate(
-        page=page, per_page=20, error_out=False)
+    users = keyset_paginate(query, User, total=count_listing('users', company_id))
     
-    companies = Company.query.filter_by(is_active=True).all()
-    selected_company = Company.query.get(company_id) if company_id else None
+    companies = active_companies()
+    selected_company = db.session.get(Company, company_id, options=[load_only(Company.name)]) if company_id else None
     
     return render_template('admin_users.html', users=users, companies=companies, selected_company=selected_company)
 
@@ -223,62 +478,60 @@ def admin_create_user():
         
         if not email or not name or not company_id:
             flash('Email, name, and company are required!', 'error')
-            companies = Company.query.filter_by(is_active=True).all()
+            companies = active_companies()
             return render_template('admin_create_user.html', companies=companies)
         
-        # Check if user already exists
-        existing_user = User.query.filter_by(email=email).first()
-        if existing_user:
-            flash('User with this email already exists!', 'error')
-            companies = Company.query.filter_by(is_active=True).all()
+        if not db.session.get(Company, company_id, options=[load_only(Company.id)]):
+            flash('Company not found!', 'error')
+            companies = active_companies()
             return render_template('admin_create_user.html', companies=companies)
         
-        # Get company name for legacy field
-        company = Company.query.get(company_id)
-        
         # Create new user
         user = User(
             email=email, 
             name=name, 
-            company=company.name if company else None,  # Legacy field
             company_id=company_id, 
             role=role
         )
         db.session.add(user)
-        db.session.commit()
+        if not commit_unique():
+            flash('User with this email already exists!', 'error')
+            companies = active_companies()
+            return render_template('admin_create_user.html', companies=companies)
+        invalidate_admin_caches()
         
         flash(f'User {name} created successfully!', 'success')
         return redirect(url_for('admin_app.admin_users'))
     
-    companies = Company.query.filter_by(is_active=True).all()
+    companies = active_companies()
     return render_template('admin_create_user.html', companies=companies)
 
 @admin_app.route('/users/<int:user_id>/edit', methods=['GET', 'POST'])
 @admin_required
 def admin_edit_user(user_id):
-    user = User.query.get_or_404(user_id)
-    
     if request.method == 'POST':
-        user.name = request.form.get('name', '').strip()
-        company_id = request.form.get('company_id', type=int)
-        user.role = request.form.get('role', 'user')
-        user.is_active = 'is_active' in request.form
-        
-        # Update company references
-        if company_id:
-            company = Company.query.get(company_id)
-            user.company_id = company_id
-            user.company = company.name if company else None
-        else:
-            # No company selected - clear company references
-            user.company_id = None
-            user.company = None
+        name = request.form.get('name', '').strip()
+        company_id = request.form.get('company_id', type=int) or None
+        
+        # Single UPDATE; company_id is cleared when no company is selected
+        result = db.session.execute(
+            update(User).where(User.id == user_id).values(
+                name=name,
+                role=request.form.get('role', 'user'),
+                is_active='is_active' in request.form,
+                company_id=company_id
+            )
+        )
+        if result.rowcount == 0:
+            abort(404)
         
         db.session.commit()
-        flash(f'User {user.name} updated successfully!', 'success')
+        invalidate_admin_caches()
+        flash(f'User {name} updated successfully!', 'success')
         return redirect(url_for('admin_app.admin_users'))
     
-    companies = Company.query.filter_by(is_active=True).all()
+    user = User.query.get_or_404(user_id)
+    companies = active_companies()
     return render_template('admin_edit_user.html', user=user, companies=companies)
 
 @admin_app.route('/users/<int:user_id>/delete', methods=['POST'])
@@ -286,27 +539,32 @@ def admin_edit_user(user_id):
 def admin_delete_user(user_id):
     user = User.query.get_or_404(user_id)
     
-    # Check if user has active assessments as creator
-    active_created_assessments = Assessment.query.filter_by(creator_id=user_id, is_active=True).count()
-    
-    # Check if user is participating in active assessments as assessee
-    active_assessee_participations = db.session.query(AssessmentParticipant).join(Assessment).filter(
-        AssessmentParticipant.assessee_id == user_id,
-        Assessment.is_active == True
-    ).count()
-    
-    # Check if user is participating in active assessments as assessor
-    active_assessor_participations = db.session.query(AssessmentParticipant).join(Assessment).filter(
-        AssessmentParticipant.assessor_id == user_id,
-        Assessment.is_active == True
-    ).count()
-    
-    # Check if user has pending invitations for active assessments
-    active_invitations = db.session.query(Invitation).join(Assessment).filter(
-        Invitation.email == user.email,
-        Invitation.is_completed == False,
-        Assessment.is_active == True
-    ).count()
+    # Count the user's involvement in active assessments (as creator, assessee,
+    # assessor and via pending invitations) in a single round-trip
+    involvement = db.session.execute(select(
+        select(func.count(Assessment.id)).where(
+            Assessment.creator_id == user_id,
+            Assessment.is_active == True
+        ).scalar_subquery().label('created'),
+        select(func.count(AssessmentParticipant.id)).select_from(AssessmentParticipant).join(Assessment).where(
+            AssessmentParticipant.assessee_id == user_id,
+            Assessment.is_active == True
+        ).scalar_subquery().label('assessee'),
+        select(func.count(AssessmentParticipant.id)).select_from(AssessmentParticipant).join(Assessment).where(
+            AssessmentParticipant.assessor_id == user_id,
+            Assessment.is_active == True
+        ).scalar_subquery().label('assessor'),
+        select(func.count(Invitation.id)).select_from(Invitation).join(Assessment).where(
+            Invitation.email == user.email,
+            Invitation.is_completed == False,
+            Assessment.is_active == True
+        ).scalar_subquery().label('invitations'),
+    )).one()
+    
+    active_created_assessments = involvement.created
+    active_assessee_participations = involvement.assessee
+    active_assessor_participations = involvement.assessor
+    active_invitations = involvement.invitations
     
     # If user has any active assessment involvement, prevent deletion
     if active_created_assessments > 0 or active_assessee_participations > 0 or active_assessor_participations > 0 or active_invitations > 0:
@@ -328,50 +586,57 @@ def admin_delete_user(user_id):
     AssessmentResponse.query.filter_by(user_id=user_id).delete()
     Invitation.query.filter_by(sender_id=user_id).delete()
     
-    # Delete user's inactive assessments and their related data
-    for assessment in user.created_assessments:
-        if not assessment.is_active:  # Only delete inactive assessments
-            Question.query.filter_by(assessment_id=assessment.id).delete()
-            Invitation.query.filter_by(assessment_id=assessment.id).delete()
-            AssessmentResponse.query.filter_by(assessment_id=assessment.id).delete()
-            AssessmentParticipant.query.filter_by(assessment_id=assessment.id).delete()
-            db.session.delete(assessment)
+    # Delete user's inactive assessments and their related data with one
+    # bulk DELETE per table, however many assessments the user created
+    inactive_assessment_ids = select(Assessment.id).where(
+        Assessment.creator_id == user_id,
+        Assessment.is_active == False
+    )
+    for model in (AssessmentResponse, AssessmentParticipant, Question, Invitation):
+        model.query.filter(model.assessment_id.in_(inactive_assessment_ids)).delete(synchronize_session=False)
+    Assessment.query.filter(
+        Assessment.creator_id == user_id,
+        Assessment.is_active == False
+    ).delete(synchronize_session=False)
     
     # Delete user's participation records in inactive assessments only
-    # First get the participation records, then delete them individually
-    participation_records = db.session.query(AssessmentParticipant).join(Assessment).filter(
+    AssessmentParticipant.query.filter(
         db.or_(
             AssessmentParticipant.assessee_id == user_id,
             AssessmentParticipant.assessor_id == user_id
         ),
-        Assessment.is_active == False
-    ).all()
-    
-    # Delete each participation record individually
-    for record in participation_records:
-        db.session.delete(record)
-    
-    db.session.delete(user)
+        AssessmentParticipant.assessment_id.in_(select(Assessment.id).where(Assessment.is_active == False))
+    ).delete(synchronize_session=False)
+    
+    # Login codes are all that still point at the user; detach them and delete
+    # the row directly instead of having the ORM load every relationship first
+    user_name = user.name
+    EmailVerification.query.filter_by(user_id=user_id).update({'user_id': None}, synchronize_session=False)
+    User.query.filter_by(id=user_id).delete(synchronize_session=False)
     db.session.commit()
+    invalidate_admin_caches()
     
-    flash(f'User {user.name} deleted successfully!', 'success')
+    flash(f'User {user_name} deleted successfully!', 'success')
     return redirect(url_for('admin_app.admin_users'))
 
 @admin_app.route('/assessments')
 @admin_required
 def admin_assessments():
-    page = request.args.get('page', 1, type=int)
     company_id = request.args.get('company_id', type=int)
     
-    query = Assessment.query
+    # Creator names plus invitation/response ids for the progress column
+    query = Assessment.query.options(
+        joinedload(Assessment.creator).load_only(User.name),
+        selectinload(Assessment.invitations).load_only(Invitation.id),
+        selectinload(Assessment.responses).load_only(AssessmentResponse.id)
+    )
     if company_id:
         query = query.filter_by(company_id=company_id)
     
-    assessments = query.order_by(Assessment.created_at.desc()).paginate(
-        page=page, per_page=20, error_out=False)
+    assessments = keyset_paginate(query, Assessment, total=count_listing('assessments', company_id))
     
-    companies = Company.query.filter_by(is_active=True).all()
-    selected_company = Company.query.get(company_id) if company_id else None
+    companies = active_companies()
+    selected_company = db.session.get(Company, company_id, options=[load_only(Company.name)]) if company_id else None
     
     return render_template('admin_assessments.html', assessments=assessments, 
                          companies=companies, selected_company=selected_company)
@@ -380,55 +645,37 @@ def admin_assessments():
 @admin_required
 def api_company_users(company_id):
     """API endpoint to get users for a specific company"""
-    users = User.query.filter_by(company_id=company_id, is_active=True).all()
-    return jsonify({
-        'users': [
-            {
-                'id': user.id,
-                'name': user.name,
-                'email': user.email,
-                'role': user.role,
-                'is_active': user.is_active
-            }
-            for user in users
-        ]
-    })
+    return jsonify({'users': get_company_users(company_id)})
 
 @admin_app.route('/api/assessment/<int:assessment_id>/available-assessors/<int:assessee_id>')
 @admin_required
 def api_available_assessors(assessment_id, assessee_id):
     """API endpoint to get available assessors for a specific assessee in an assessment"""
-    assessment = Assessment.query.get_or_404(assessment_id)
-    
-    # Get ALL active users from the same company as the assessment
-    # No role filtering - any user can be an assessor in any assessment
-    company_users = User.query.filter_by(company_id=assessment.company_id, is_active=True).all()
+    assessment = db.session.get(Assessment, assessment_id, options=[load_only(Assessment.company_id)])
+    if assessment is None:
+        abort(404)
     
-    # Get existing assessors for this assessee in this assessment
-    existing_assessors = db.session.query(AssessmentParticipant.assessor_id).filter(
+    # Existing assessors for this assessee in this assessment
+    existing_assessor_ids = select(AssessmentParticipant.assessor_id).where(
         AssessmentParticipant.assessment_id == assessment_id,
         AssessmentParticipant.assessee_id == assessee_id,
         AssessmentParticipant.assessor_id.isnot(None)
-    ).all()
-    existing_assessor_ids = [id[0] for id in existing_assessors]
+    )
     
-    # Filter out existing assessors and the assessee themselves
-    available_assessors = [
-        user for user in company_users 
-        if user.id not in existing_assessor_ids and user.id != assessee_id
-    ]
+    # ALL active users from the same company as the assessment, minus existing
+    # assessors and the assessee themselves - filtered in the database
+    # No role filtering - any user can be an assessor in any assessment
+    # Role is kept for reference only
+    available_assessors = db.session.execute(
+        select(User.id, User.name, User.email, User.role).where(
+            User.company_id == assessment.company_id,
+            User.is_active == True,
+            User.id != assessee_id,
+            User.id.notin_(existing_assessor_ids)
+        )
+    ).all()
     
-    return jsonify({
-        'assessors': [
-            {
-                'id': assessor.id,
-                'name': assessor.name,
-                'email': assessor.email,
-                'role': assessor.role  # Keep showing role for reference
-            }
-            for assessor in available_assessors
-        ]
-    })
+    return jsonify({'assessors': [assessor._asdict() for assessor in available_assessors]})
 
 @admin_app.route('/api/companies', methods=['POST'])
 @admin_required
@@ -445,15 +692,12 @@ def api_create_company():
     if not industry:
         return jsonify({'success': False, 'message': 'Industry is required!'})
     
-    # Check if company already exists
-    existing_company = Company.query.filter_by(name=name).first()
-    if existing_company:
-        return jsonify({'success': False, 'message': 'Company with this name already exists!'})
-    
     # Create new company
     company = Company(name=name, description=description, industry=industry)
     db.session.add(company)
-    db.session.commit()
+    if not commit_unique():
+        return jsonify({'success': False, 'message': 'Company with this name already exists!'})
+    invalidate_admin_caches()
     
     return jsonify({
         'success': True,
@@ -480,7 +724,7 @@ def api_create_user():
         company_id = data.get('company_id')
         role = data.get('role', 'user')
         
-        print(f"DEBUG: Received data - name: {name}, email: {email}, company_id: {company_id}, role: {role}")
+        current_app.logger.debug("api_create_user received name=%s email=%s company_id=%s role=%s", name, email, company_id, role)
         
         if not email or not name or not company_id:
             return jsonify({'success': False, 'message': 'Email, name, and company are required!'})
@@ -491,28 +735,22 @@ def api_create_user():
         except (ValueError, TypeError):
             return jsonify({'success': False, 'message': 'Invalid company ID!'})
         
-        # Check if user already exists (only prevent for non-assessee roles)
-        existing_user = User.query.filter_by(email=email).first()
-        if existing_user and role != 'assessee':
-            return jsonify({'success': False, 'message': 'User with this email already exists!'})
-        
-        # Get company name for legacy field
-        company = Company.query.get(company_id)
-        if not company:
+        if not db.session.get(Company, company_id, options=[load_only(Company.id)]):
             return jsonify({'success': False, 'message': 'Company not found!'})
         
         # Create new user
         user = User(
             email=email, 
             name=name, 
-            company=company.name,  # Legacy field
             company_id=company_id, 
             role=role
         )
         db.session.add(user)
-        db.session.commit()
+        if not commit_unique():
+            return jsonify({'success': False, 'message': 'User with this email already exists!'})
+        invalidate_admin_caches()
         
-        print(f"DEBUG: Successfully created user - ID: {user.id}, Name: {user.name}, Email: {user.email}")
+        current_app.logger.debug("api_create_user created user id=%s email=%s", user.id, user.email)
         
         return jsonify({
             'success': True,
@@ -525,7 +763,7 @@ def api_create_user():
         })
         
     except Exception as e:
-        print(f"ERROR: Exception in api_create_user: {e}")
+        current_app.logger.exception("Exception in api_create_user")
         db.session.rollback()
         return jsonify({'success': False, 'message': f'Server error: {str(e)}'})
 
@@ -547,50 +785,72 @@ def admin_create_assessment():
         assessee_ids_str = request.form.get('assessees', '')
         assessor_data_str = request.form.get('assessors', '')
         
-        assessee_ids = [int(id.strip()) for id in assessee_ids_str.split(',') if id.strip()]
-        
-        # Parse assessor data (now includes relationships)
+        # Parse assessor data (now includes relationships); ids are cast to int once here
         assessor_data = []
-        if assessor_data_str:
-            try:
-                assessor_data = json.loads(assessor_data_str)
-            except json.JSONDecodeError:
-                # Fallback to old format (just IDs)
-                assessor_ids = [int(id.strip()) for id in assessor_data_str.split(',') if id.strip()]
-                assessor_data = [{'id': id, 'relationship': ''} for id in assessor_ids]
+        try:
+            assessee_ids = [int(id.strip()) for id in assessee_ids_str.split(',') if id.strip()]
+            if assessor_data_str:
+                try:
+                    assessor_data = json.loads(assessor_data_str)
+                except json.JSONDecodeError:
+                    assessor_data = None
+                if not isinstance(assessor_data, list):
+                    # Fallback to old format (just IDs)
+                    assessor_ids = [int(id.strip()) for id in assessor_data_str.split(',') if id.strip()]
+                    assessor_data = [{'id': id, 'relationship': ''} for id in assessor_ids]
+                for assessor_info in assessor_data:
+                    assessor_info['id'] = int(assessor_info['id'])
+        except (ValueError, TypeError, KeyError):
+            flash('Invalid participant selection!', 'error')
+            companies = active_companies()
+            users = active_users()
+            return render_template('admin_create_assessment.html', companies=companies, users=users)
         
         if not title or not company_id:
             flash('Assessment title and company are required!', 'error')
-            companies = Company.query.filter_by(is_active=True).all()
-            users = User.query.filter_by(is_active=True).all()
+            companies = active_companies()
+            users = active_users()
             return render_template('admin_create_assessment.html', companies=companies, users=users)
         
         if not assessee_ids:
             flash('One assessee must be selected!', 'error')
-            companies = Company.query.filter_by(is_active=True).all()
-            users = User.query.filter_by(is_active=True).all()
+            companies = active_companies()
+            users = active_users()
             return render_template('admin_create_assessment.html', companies=companies, users=users)
         
         if len(assessee_ids) > 1:
             flash('Only one assessee can be selected per assessment!', 'error')
-            companies = Company.query.filter_by(is_active=True).all()
-            users = User.query.filter_by(is_active=True).all()
+            companies = active_companies()
+            users = active_users()
             return render_template('admin_create_assessment.html', companies=companies, users=users)
         
         if not assessor_data:
             flash('At least one assessor must be selected!', 'error')
-            companies = Company.query.filter_by(is_active=True).all()
-            users = User.query.filter_by(is_active=True).all()
+            companies = active_companies()
+            users = active_users()
+            return render_template('admin_create_assessment.html', companies=companies, users=users)
+        
+        # Check every selected participant in one query; the invitation emails
+        # below are built from these rows too
+        participant_ids = set(assessee_ids) | {assessor_info['id'] for assessor_info in assessor_data}
+        participant_users = {
+            user.id: user for user in
+            User.query.options(load_only(User.name, User.email)).filter(User.id.in_(participant_ids))
+        }
+        if len(participant_users) != len(participant_ids):
+            flash('Some selected participants no longer exist!', 'error')
+            companies = active_companies()
+            users = active_users()
             return render_template('admin_create_assessment.html', companies=companies, users=users)
         
         deadline = None
         if deadline_str:
             try:
-                deadline = datetime.strptime(deadline_str, '%Y-%m-%dT%H:%M')
+                deadline = datetime.fromisoformat(deadline_str)
             except ValueError:
                 flash('Invalid deadline format!', 'error')
-                companies = Company.query.filter_by(is_active=True).all()
-                users = User.query.filter_by(is_active=True).all()
+                companies = active_companies()
+                users = active_users()
                 return render_template('admin_create_assessment.html', companies=companies, users=users)
         
         # Create assessment
@@ -605,142 +865,145 @@ def admin_create_assessment():
         db.session.flush()  # Get the ID
         
         # Add questions
-        questions = []
+        question_count = 0
         question_index = 0
         
         if use_template:
             # Copy predefined questions from template (assessment_id = 0)
-            template_questions = Question.query.filter_by(assessment_id=0, language=language).order_by(Question.order).all()
-            for template_q in template_questions:
-                question = Question(
-                    assessment_id=assessment.id,
-                    question_text=template_q.question_text,
-                    question_group=template_q.question_group,
-                    question_type=template_q.question_type,
-                    language=template_q.language,
-                    order=template_q.order
-                )
-                questions.append(question)
-                db.session.add(question)
+            # with a single INSERT ... SELECT inside the database
+            template_columns = ['assessment_id', 'question_text', 'question_group', 'question_type', 'language', 'options', 'order']
+            template_questions = select(
+                literal(assessment.id),
+                Question.question_text,
+                Question.question_group,
+                Question.question_type,
+                Question.language,
+                Question.options,
+                Question.order
+            ).where(Question.assessment_id == 0, Question.language == language).order_by(Question.order)
+            result = db.session.execute(Question.__table__.insert().from_select(template_columns, template_questions))
+            question_count = result.rowcount
         else:
-            # Add custom questions from form
+            # Add custom questions from form - collected as rows and inserted in one batch
+            question_rows = []
             while f'question_{question_index}_text' in request.form:
                 question_text = request.form.get(f'question_{question_index}_text', '').strip()
                 question_type = request.form.get(f'question_{question_index}_type', 'rating')
                 question_group = request.form.get(f'question_{question_index}_group', '').strip()
                 
                 if question_text:
-                    question = Question(
-                        assessment_id=assessment.id,
-                        question_text=question_text,
-                        question_group=question_group,
-                        question_type=question_type,
-                        language=language,
-                        order=question_index
-                    )
-                    questions.append(question)
-                    db.session.add(question)
+                    question_rows.append({
+                        'assessment_id': assessment.id,
+                        'question_text': question_text,
+                        'question_group': question_group,
+                        'question_type': question_type,
+                        'language': language,
+                        'order': question_index
+                    })
                 
                 question_index += 1
+            
+            if question_rows:
+                db.session.execute(Question.__table__.insert(), question_rows)
+                question_count = len(question_rows)
         
-        if not questions:
+        if not question_count:
             flash('At least one question is required!', 'error')
             db.session.rollback()
-            companies = Company.query.filter_by(is_active=True).all()
-            users = User.query.filter_by(is_active=True).all()
+            companies = active_companies()
+            users = active_users()
             return render_template('admin_create_assessment.html', companies=companies, users=users)
         
-        # Create assessment participants
-        participants_created = 0
+        # Create assessment participants in one batch
+        participant_rows = []
         
         for assessee_id in assessee_ids:
-            assessee_id = int(assessee_id)
-            
             # Add self-assessment participant (assessee assessing themselves)
-            self_participant = AssessmentParticipant(
-                assessment_id=assessment.id,
-                assessee_id=assessee_id,
-                assessor_id=None  # Self-assessment
-            )
-            db.session.add(self_participant)
-            participants_created += 1
+            participant_rows.append({
+                'assessment_id': assessment.id,
+                'assessee_id': assessee_id,
+                'assessor_id': None,  # Self-assessment
+                'assessor_relationship': None
+            })
             
             # Add assessor participants (each assessor assesses this assessee)
-            for assessor_info in assessor_data:
-                assessor_id = int(assessor_info['id'])
-                relationship = assessor_info.get('relationship', '')
-                if assessor_id != assessee_id:  # Don't add assessee as their own assessor
-                    assessor_participant = AssessmentParticipant(
-                        assessment_id=assessment.id,
-                        assessee_id=assessee_id,
-                        assessor_id=assessor_id,
-                        assessor_relationship=relationship
-                    )
-                    db.session.add(assessor_participant)
-                    participants_created += 1
+            # Don't add assessee as their own assessor
+            participant_rows.extend({
+                'assessment_id': assessment.id,
+                'assessee_id': assessee_id,
+                'assessor_id': assessor_info['id'],
+                'assessor_relationship': assessor_info.get('relationship', '')
+            } for assessor_info in assessor_data if assessor_info['id'] != assessee_id)
+        
+        db.session.execute(AssessmentParticipant.__table__.insert(), participant_rows)
+        participants_created = len(participant_rows)
         
         db.session.commit()
+        invalidate_admin_caches()
         
         # Send invitations if requested
         sent_count = 0
         if send_invitations:
-            participants = AssessmentParticipant.query.filter_by(assessment_id=assessment.id).all()
+            messages = []
+            invitation_rows = []
+            tokens = iter(generate_tokens(len(participant_rows)))
             
-            for participant in participants:
+            for participant in participant_rows:
+                assessee = participant_users[participant['assessee_id']]
+                
                 # Send invitation to assessee for self-assessment
-                if not participant.assessor_id:  # Self-assessment
-                    token = secrets.token_urlsafe(32)
-                    invitation = Invitation(
-                        assessment_id=assessment.id,
-                        sender_id=1,  # Admin sender
-                        email=participant.assessee.email,
-                        token=token
-                    )
-                    db.session.add(invitation)
+                if not participant['assessor_id']:  # Self-assessment
+                    token = next(tokens)
+                    invitation_rows.append({
+                        'assessment_id': assessment.id,
+                        'sender_id': 1,  # Admin sender
+                        'email': assessee.email,
+                        'token': token
+                    })
                     
                     try:
-                        send_self_assessment_invitation(participant.assessee.email, assessment, token)
-                        sent_count += 1
-                    except Exception as e:
-                        print(f"Error sending self-assessment invitation: {e}")
+                        messages.append(build_self_assessment_message(assessee.email, assessment, token))
+                    except Exception:
+                        current_app.logger.exception("Error preparing self-assessment invitation")
                 
                 # Send invitation to assessor
                 else:
-                    token = secrets.token_urlsafe(32)
-                    invitation = Invitation(
-                        assessment_id=assessment.id,
-                        sender_id=1,  # Admin sender
-                        email=participant.assessor.email,
-                        token=token
-                    )
-                    db.session.add(invitation)
+                    assessor = participant_users[participant['assessor_id']]
+                    token = next(tokens)
+                    invitation_rows.append({
+                        'assessment_id': assessment.id,
+                        'sender_id': 1,  # Admin sender
+                        'email': assessor.email,
+                        'token': token
+                    })
                     
                     try:
-                        send_assessor_invitation(participant.assessor.email, assessment, 
-                                               participant.assessee.name, token)
-                        sent_count += 1
-                    except Exception as e:
-                        print(f"Error sending assessor invitation: {e}")
+                        messages.append(build_assessor_message(assessor.email, assessment, 
+                                                               assessee.name, token))
+                    except Exception:
+                        current_app.logger.exception("Error preparing assessor invitation")
             
+            if invitation_rows:
+                db.session.execute(Invitation.__table__.insert(), invitation_rows)
             db.session.commit()
+            
+            # Emails go out in the background once the invitations are committed
+            sent_count = queue_emails(messages)
         
         if send_invitations and sent_count > 0:
-            flash(f'Assessment "{title}" created successfully with {len(questions)} questions and {participants_created} participants! {sent_count} invitations sent.', 'success')
+            flash(f'Assessment "{title}" created successfully with {question_count} questions and {participants_created} participants! {sent_count} invitations queued for sending.', 'success')
         else:
-            flash(f'Assessment "{title}" created successfully with {len(questions)} questions and {participants_created} participants! Invitations can be sent later.', 'success')
+            flash(f'Assessment "{title}" created successfully with {question_count} questions and {participants_created} participants! Invitations can be sent later.', 'success')
         return redirect(url_for('admin_app.admin_assessments'))
     
-    companies = Company.query.filter_by(is_active=True).all()
-    users = User.query.filter_by(is_active=True).all()
+    companies = active_companies()
+    users = active_users()
     
     # Get template question groups for preview
-    bosnian_groups = db.session.query(Question.question_group).filter_by(assessment_id=0, language='bs').distinct().all()
-    english_groups = db.session.query(Question.question_group).filter_by(assessment_id=0, language='en').distinct().all()
-    
     return render_template('admin_create_assessment.html', 
                          companies=companies, users=users,
-                         bosnian_groups=[g[0] for g in bosnian_groups],
-                         english_groups=[g[0] for g in english_groups])
+                         bosnian_groups=list(get_template_question_groups('bs')),
+                         english_groups=list(get_template_question_groups('en')))
 
 @admin_app.route('/assessments/<int:assessment_id>/edit', methods=['GET', 'POST'])
 @admin_required
@@ -755,8 +1018,8 @@ def admin_edit_assessment(assessment_id):
         
         if not assessment.title or not company_id:
             flash('Assessment title and company are required!', 'error')
-            companies = Company.query.filter_by(is_active=True).all()
-            users = User.query.filter_by(is_active=True).all()
+            companies = active_companies()
+            users = active_users()
             return render_template('admin_edit_assessment.html', assessment=assessment, companies=companies, users=users)
         
         assessment.company_id = company_id
@@ -764,11 +1027,11 @@ def admin_edit_assessment(assessment_id):
         # Handle deadline
         if deadline_str:
             try:
-                assessment.deadline = datetime.strptime(deadline_str, '%Y-%m-%dT%H:%M')
+                assessment.deadline = datetime.fromisoformat(deadline_str)
             except ValueError:
                 flash('Invalid deadline format!', 'error')
-                companies = Company.query.filter_by(is_active=True).all()
-                users = User.query.filter_by(is_active=True).all()
+                companies = active_companies()
+                users = active_users()
                 return render_template('admin_edit_assessment.html', assessment=assessment, companies=companies, users=users)
         else:
             assessment.deadline = None
@@ -777,11 +1040,12 @@ def admin_edit_assessment(assessment_id):
         assessment.is_active = 'is_active' in request.form
         
         db.session.commit()
+        invalidate_admin_caches()
         flash(f'Assessment "{assessment.title}" updated successfully!', 'success')
         return redirect(url_for('admin_app.admin_assessments'))
     
-    companies = Company.query.filter_by(is_active=True).all()
-    users = User.query.filter_by(is_active=True).all()
+    companies = active_companies()
+    users = active_users()
     
     return render_template('admin_edit_assessment.html', assessment=assessment, companies=companies, users=users)
 
@@ -789,21 +1053,8 @@ def admin_edit_assessment(assessment_id):
 @admin_required
 def admin_question_templates():
     """View predefined question templates"""
-    bosnian_questions = Question.query.filter_by(assessment_id=0, language='bs').order_by(Question.order).all()
-    english_questions = Question.query.filter_by(assessment_id=0, language='en').order_by(Question.order).all()
-    
-    # Group questions by category, but maintain order within each group
-    bosnian_groups = {}
-    for q in bosnian_questions:
-        if q.question_group not in bosnian_groups:
-            bosnian_groups[q.question_group] = []
-        bosnian_groups[q.question_group].append(q)
-    
-    english_groups = {}
-    for q in english_questions:
-        if q.question_group not in english_groups:
-            english_groups[q.question_group] = []
-        english_groups[q.question_group].append(q)
+    bosnian_groups = get_template_question_groups('bs')
+    english_groups = get_template_question_groups('en')
     
     return render_template('admin_question_templates.html', 
                          bosnian_groups=bosnian_groups, 
@@ -817,14 +1068,11 @@ def admin_assessment_participants(assessment_id):
     
     # Get ALL active users from the same company as the assessment
     # No role filtering - any user can be assessee or assessor in any assessment
-    company_users = User.query.filter_by(company_id=assessment.company_id, is_active=True).all()
-    # For backward compatibility, still separate the lists but include all users
-    assessees = company_users  # Any user can be an assessee
-    assessors = company_users  # Any user can be an assessor
+    company_users = get_company_users(assessment.company_id)
     
     return render_template('admin_assessment_participants.html', 
                          assessment=assessment, participants=participants,
-                         assessees=assessees, assessors=assessors)
+                         company_users=company_users)
 
 @admin_app.route('/assessments/<int:assessment_id>/add-participant', methods=['POST'])
 @admin_required
@@ -840,25 +1088,25 @@ def admin_add_participant(assessment_id):
     # Note: Removed check for existing assessee to allow duplicates
     # This allows the same person to be added multiple times as an assessee
     
-    # Add self-assessment participant (assessee assessing themselves)
-    self_participant = AssessmentParticipant(
-        assessment_id=assessment_id,
-        assessee_id=assessee_id,
-        assessor_id=None  # Self-assessment
-    )
-    db.session.add(self_participant)
-    
-    # Add assessor participants
-    for assessor_id in assessor_ids:
-        if assessor_id and int(assessor_id) != assessee_id:  # Don't add assessee as their own assessor
-            assessor_participant = AssessmentParticipant(
-                assessment_id=assessment_id,
-                assessee_id=assessee_id,
-                assessor_id=int(assessor_id)
-            )
-            db.session.add(assessor_participant)
-    
+    # Self-assessment participant (assessee assessing themselves)
+    participant_rows = [{
+        'assessment_id': assessment_id,
+        'assessee_id': assessee_id,
+        'assessor_id': None  # Self-assessment
+    }]
+    
+    # Assessor participants
+    # Don't add assessee as their own assessor
+    participant_rows.extend({
+        'assessment_id': assessment_id,
+        'assessee_id': assessee_id,
+        'assessor_id': int(assessor_id)
+    } for assessor_id in assessor_ids if assessor_id and int(assessor_id) != assessee_id)
+    
+    # One multi-row INSERT for all participants
+    db.session.execute(AssessmentParticipant.__table__.insert(), participant_rows)
     db.session.commit()
+    invalidate_admin_caches()
     
     # Send invitations
     assessee = User.query.get(assessee_id)
@@ -918,6 +1166,7 @@ def admin_delete_participant(assessment_id, participant_id):
     # Delete the participant
     db.session.delete(participant)
     db.session.commit()
+    invalidate_admin_caches()
     
     if participant.assessor:
         flash(f'{participant_type} {participant_name} removed from assessment for {assessee_name}!', 'success')
@@ -930,48 +1179,57 @@ def admin_delete_participant(assessment_id, participant_id):
 @admin_required
 def admin_send_assessment_invitations(assessment_id):
     assessment = Assessment.query.get_or_404(assessment_id)
-    participants = AssessmentParticipant.query.filter_by(assessment_id=assessment_id).all()
+    # Both users of every participant are read below - load them in two IN queries
+    participants = AssessmentParticipant.query.options(
+        selectinload(AssessmentParticipant.assessee).load_only(User.name, User.email),
+        selectinload(AssessmentParticipant.assessor).load_only(User.name, User.email)
+    ).filter_by(assessment_id=assessment_id).all()
     
-    sent_count = 0
+    messages = []
+    invitation_rows = []
+    tokens = iter(generate_tokens(len(participants)))
     
     for participant in participants:
         # Send invitation to assessee for self-assessment
         if not participant.assessor_id:  # Self-assessment
-            token = secrets.token_urlsafe(32)
-            invitation = Invitation(
-                assessment_id=assessment_id,
-                sender_id=1,  # Admin sender
-                email=participant.assessee.email,
-                token=token
-            )
-            db.session.add(invitation)
+            token = next(tokens)
+            invitation_rows.append({
+                'assessment_id': assessment_id,
+                'sender_id': 1,  # Admin sender
+                'email': participant.assessee.email,
+                'token': token
+            })
             
             try:
-                send_self_assessment_invitation(participant.assessee.email, assessment, token, participant.assessee.name)
-                sent_count += 1
-            except Exception as e:
-                print(f"Error sending self-assessment invitation: {e}")
+                messages.append(build_self_assessment_message(participant.assessee.email, assessment, token, participant.assessee.name))
+            except Exception:
+                current_app.logger.exception("Error preparing self-assessment invitation")
         
         # Send invitation to assessor
         else:
-            token = secrets.token_urlsafe(32)
-            invitation = Invitation(
-                assessment_id=assessment_id,
-                sender_id=1,  # Admin sender
-                email=participant.assessor.email,
-                token=token
-            )
-            db.session.add(invitation)
+            token = next(tokens)
+            invitation_rows.append({
+                'assessment_id': assessment_id,
+                'sender_id': 1,  # Admin sender
+                'email': participant.assessor.email,
+                'token': token
+            })
             
             try:
-                send_assessor_invitation(participant.assessor.email, assessment, 
-                                       participant.assessee.name, token, participant.assessor_relationship)
-                sent_count += 1
-            except Exception as e:
-                print(f"Error sending assessor invitation: {e}")
-    
+                messages.append(build_assessor_message(participant.assessor.email, assessment, 
+                                                       participant.assessee.name, token, participant.assessor_relationship))
+            except Exception:
+                current_app.logger.exception("Error preparing assessor invitation")
+    
+    # One multi-row INSERT for all invitations
+    if invitation_rows:
+        db.session.execute(Invitation.__table__.insert(), invitation_rows)
     db.session.commit()
-    flash(f'Sent {sent_count} invitations successfully!', 'success')
+    invalidate_admin_caches()
+    
+    # Emails go out in the background once the invitations are committed
+    sent_count = queue_emails(messages)
+    flash(f'Queued {sent_count} invitations for sending!', 'success')
     return redirect(url_for('admin_app.admin_assessment_participants', assessment_id=assessment_id))
 
 @admin_app.route('/assessments/<int:assessment_id>/delete', methods=['POST'])
@@ -981,45 +1239,71 @@ def admin_delete_assessment(assessment_id):
     title = assessment.title
     
     try:
-        # Delete related records in proper order (to handle foreign key constraints)
-        # First delete responses that reference participants
-        AssessmentResponse.query.filter_by(assessment_id=assessment_id).delete()
-        
-        # Then delete participants (which might be referenced by responses)
-        AssessmentParticipant.query.filter_by(assessment_id=assessment_id).delete()
-        
-        # Delete other related records
-        Question.query.filter_by(assessment_id=assessment_id).delete()
-        Invitation.query.filter_by(assessment_id=assessment_id).delete()
-        
-        # Finally delete the assessment itself
-        db.session.delete(assessment)
+        # Delete related records in proper order (to handle foreign key constraints):
+        # responses reference participants and invitations, so they go first.
+        # Plain bulk DELETEs - nothing is loaded into the session beforehand
+        for model in (AssessmentResponse, AssessmentParticipant, Question, Invitation):
+            model.query.filter_by(assessment_id=assessment_id).delete(synchronize_session=False)
+        
+        # Finally delete the assessment itself (also in bulk, so its child
+        # collections aren't loaded just to be emptied)
+        Assessment.query.filter_by(id=assessment_id).delete(synchronize_session=False)
         db.session.commit()
+        invalidate_admin_caches()
         
         flash(f'Assessment "{title}" deleted successfully!', 'success')
         
     except Exception as e:
         db.session.rollback()
-        print(f"Error deleting assessment: {e}")
+        current_app.logger.exception("Error deleting assessment %s", assessment_id)
         flash(f'Error deleting assessment: {str(e)}', 'error')
     
     return redirect(url_for('admin_app.admin_assessments'))
 
+# Exports with at least this many responses are cached after the first build
+EXPORT_CACHE_MIN_RESPONSES = int(os.environ.get('EXPORT_CACHE_MIN_RESPONSES', 200))
+EXPORT_CACHE_TIMEOUT = 600
+EXPORT_CACHE_VERSION_KEY = 'assessment-csv/version'
+
+def csv_attachment(body, filename):
+    """CSV download response for a string body or a row generator"""
+    return Response(body, mimetype='text/csv',
+                    headers={'Content-Disposition': f'attachment; filename={filename}'})
+
 # Export Assessment to Excel
 @admin_app.route('/assessments/<int:assessment_id>/export/excel')
 @admin_required
 def admin_export_assessment_excel(assessment_id):
     assessment = Assessment.query.get_or_404(assessment_id)
     
-    # Create CSV content
-    output = io.StringIO()
-    writer = csv.writer(output)
+    # Large exports are kept in the cache, keyed on the admin data version (bumped
+    # by every admin edit), the questions and the responses, so repeat downloads
+    # don't rebuild them
+    response_count, last_submitted, question_count, last_question_id = db.session.execute(select(
+        select(func.count(AssessmentResponse.id)).where(AssessmentResponse.assessment_id == assessment_id).scalar_subquery(),
+        select(func.max(AssessmentResponse.submitted_at)).where(AssessmentResponse.assessment_id == assessment_id).scalar_subquery(),
+        select(func.count(Question.id)).where(Question.assessment_id == assessment_id).scalar_subquery(),
+        select(func.max(Question.id)).where(Question.assessment_id == assessment_id).scalar_subquery()
+    )).one()
+    cache_key = None
+    if response_count >= EXPORT_CACHE_MIN_RESPONSES:
+        cache_key = (f"assessment-csv/{cache.get(EXPORT_CACHE_VERSION_KEY) or ''}/{assessment_id}/"
+                     f"{question_count}-{last_question_id}/{response_count}/"
+                     f"{last_submitted.isoformat() if last_submitted else ''}")
+        cached = cache.get(cache_key)
+        if cached:
+            return csv_attachment(*cached)
     
     # Get company information
     company = assessment.company_ref
     
     # Get all assessment questions sorted by order
     questions = sorted(assessment.questions, key=lambda q: q.order)
+    # Order -> question lookup; reversed so the first question wins on duplicate orders
+    questions_by_order = {q.order: q for q in reversed(questions)}
+    # Response key for each of the 39 answer columns (None where no question has that order)
+    answer_keys = [f"question_{questions_by_order[i].id}" if i in questions_by_order else None
+                   for i in range(1, 40)]
     
     # Create header row with basic info + questions 1-39
     header = [
@@ -1038,105 +1322,107 @@ def admin_export_assessment_excel(assessment_id):
     for i in range(1, 40):  # Questions 1-39
         header.append(str(i))
     
-    writer.writerow(header)
+    # Load responses with their participant, assessee, assessor and user in one query
+    responses = AssessmentResponse.query.options(
+        joinedload(AssessmentResponse.participant).joinedload(AssessmentParticipant.assessee),
+        joinedload(AssessmentResponse.participant).joinedload(AssessmentParticipant.assessor),
+        joinedload(AssessmentResponse.user)
+    ).filter_by(assessment_id=assessment_id).all()
     
-    # Write data for each response
-    for response in assessment.responses:
-        try:
-            response_data = json.loads(response.responses) if response.responses else {}
-            
-            # Get participant information
-            participant = AssessmentParticipant.query.get(response.participant_id) if response.participant_id else None
-            
-            # Initialize assessee name (this will be the same for all participants in this assessment)
-            assessee_name = ""
-            
-            if participant:
-                # Get the assessee name (this is always available from the participant record)
-                assessee_name = participant.assessee.name if participant.assessee else ""
+    # Create filename with assessment and assessee names
+    filename = export_filename(assessment, (response.participant for response in responses), 'export.csv')
+    
+    # Stream the CSV row by row so the client starts receiving data immediately
+    # and the full file is never held in memory
+    def generate():
+        output = io.StringIO()
+        writer = csv.writer(output)
+        
+        def flush():
+            data = output.getvalue()
+            output.seek(0)
+            output.truncate()
+            return data
+        
+        writer.writerow(header)
+        yield flush()
+        
+        # Write data for each response
+        for response in responses:
+            try:
+                response_data = orjson.loads(response.responses) if response.responses else {}
                 
-                if participant.assessor_id:  # Assessor response
-                    participant_id = participant.assessor_id
-                    participant_name = participant.assessor.name
-                    participant_email = participant.assessor.email
-                    # Ensure we always have a meaningful role
-                    if participant.assessor_relationship and participant.assessor_relationship.strip():
-                        participant_role = participant.assessor_relationship.strip()
-                    else:
-                        participant_role = "Assessor"
-                else:  # Self-assessment response
-                    participant_id = participant.assessee_id
-                    participant_name = participant.assessee.name
-                    participant_email = participant.assessee.email
-                    participant_role = "Self-Assessment"
-            else:
-                # Fallback to user if participant not found
-                participant_id = response.user_id if response.user else None
-                participant_name = response.user.name if response.user else "Anonymous"
-                participant_email = response.user.email if response.user else "N/A"
-                # Ensure we always have a meaningful role, never null
-                if response.user and response.user.role and response.user.role.strip():
-                    participant_role = response.user.role.strip()
-                else:
-                    participant_role = "User"
-            
-            # Create row with basic participant info
-            row = [
-                assessment.id,
-                company.id if company else "",
-                company.name if company else "",
-                company.industry if company else "",
-                participant_id or "",
-                assessee_name,
-                participant_name,
-                participant_email,
-                participant_role,
-            ]
-            
-            # Add responses for questions 1-39
-            for i in range(1, 40):
-                # Find question with this order (now questions have order 1-39, not 0-38)
-                question = next((q for q in questions if q.order == i), None)
-                if question:
-                    question_key = f"question_{question.id}"
-                    raw_answer = response_data.get(question_key, "")
+                # Get participant information
+                participant = response.participant
+                
+                # Initialize assessee name (this will be the same for all participants in this assessment)
+                assessee_name = ""
+                
+                if participant:
+                    # Get the assessee name (this is always available from the participant record)
+                    assessee_name = participant.assessee.name if participant.assessee else ""
                     
-                    # Clean up the answer
-                    if raw_answer and str(raw_answer).strip():
-                        answer = str(raw_answer).strip()
-                    else:
-                        answer = ""
-                    row.append(answer)
+                    if participant.assessor_id:  # Assessor response
+                        participant_id = participant.assessor_id
+                        participant_name = participant.assessor.name
+                        participant_email = participant.assessor.email
+                        # Ensure we always have a meaningful role
+                        if participant.assessor_relationship and participant.assessor_relationship.strip():
+                            participant_role = participant.assessor_relationship.strip()
+                        else:
+                            participant_role = "Assessor"
+                    else:  # Self-assessment response
+                        participant_id = participant.assessee_id
+                        participant_name = participant.assessee.name
+                        participant_email = participant.assessee.email
+                        participant_role = "Self-Assessment"
                 else:
-                    row.append("")  # No question for this position
-            
-            writer.writerow(row)
-            
-        except Exception as e:
-            print(f"Error processing response {response.id}: {e}")
-            continue
-    
-    # Get assessee names for filename
-    assessees = []
-    for response in assessment.responses:
-        participant = AssessmentParticipant.query.get(response.participant_id) if response.participant_id else None
-        if participant and not participant.assessor_id:  # Self-assessment response (assessee)
-            assessee_name = participant.assessee.name.replace(" ", "_")
-            if assessee_name not in assessees:
-                assessees.append(assessee_name)
-    
-    # Create filename with assessment and assessee names
-    assessee_part = "_".join(assessees) if assessees else "NoAssessee"
-    safe_title = assessment.title.replace(" ", "_").replace("/", "_").replace("\\", "_")
-    filename = f"assessment_{assessment_id}_{safe_title}_{assessee_part}_export.csv"
+                    # Fallback to user if participant not found
+                    participant_id = response.user_id if response.user else None
+                    participant_name = response.user.name if response.user else "Anonymous"
+                    participant_email = response.user.email if response.user else "N/A"
+                    # Ensure we always have a meaningful role, never null
+                    if response.user and response.user.role and response.user.role.strip():
+                        participant_role = response.user.role.strip()
+                    else:
+                        participant_role = "User"
+                
+                # Create row with basic participant info
+                row = [
+                    assessment.id,
+                    company.id if company else "",
+                    company.name if company else "",
+                    company.industry if company else "",
+                    participant_id or "",
+                    assessee_name,
+                    participant_name,
+                    participant_email,
+                    participant_role,
+                ]
+                
+                # Add responses for questions 1-39 (questions have order 1-39, not 0-38),
+                # cleaned up and left blank where there is no question or answer
+                row.extend(
+                    str(raw_answer).strip() if raw_answer else ""
+                    for raw_answer in (response_data.get(key) if key else None for key in answer_keys)
+                )
+                
+                writer.writerow(row)
+                yield flush()
+                
+            except Exception:
+                current_app.logger.exception("Error processing response %s", response.id)
+                continue
     
-    # Create response
-    output.seek(0)
-    response = make_response(output.getvalue())
-    response.headers['Content-Type'] = 'text/csv'
-    response.headers['Content-Disposition'] = f'attachment; filename={filename}'
+    def generate_and_cache():
+        # Still streamed; the chunks are kept and cached once the last one is sent
+        chunks = []
+        for chunk in generate():
+            chunks.append(chunk)
+            yield chunk
+        cache.set(cache_key, (''.join(chunks), filename), timeout=EXPORT_CACHE_TIMEOUT)
     
-    return response
+    return csv_attachment(stream_with_context(generate_and_cache() if cache_key else generate()), filename)
 
 # Export Assessment Detailed Report
 @admin_app.route('/assessments/<int:assessment_id>/export/detailed')
@@ -1144,8 +1430,9 @@ def admin_export_assessment_excel(assessment_id):
 def admin_export_assessment_detailed(assessment_id):
     assessment = Assessment.query.get_or_404(assessment_id)
     
-    # Get participant counts for reporting
-    total_participants = len(assessment.invitations)
+    # Get participant counts for reporting - invitations are only counted, so
+    # COUNT them in SQL; the responses are loaded for the report anyway
+    total_participants = db.session.scalar(select(func.count(Invitation.id)).where(Invitation.assessment_id == assessment_id))
     completed_responses = len(assessment.responses)
     
     # Create detailed report content
@@ -1174,6 +1461,11 @@ def admin_export_assessment_detailed(assessment_id):
             question_groups[group] = []
         question_groups[group].append(question)
     
+    # Fetch every participant referenced by the responses, and parse every
+    # response's answers, once up front rather than once per question
+    participants = load_participants_by_id(r.participant_id for r in assessment.responses)
+    parsed_responses = parse_response_data(assessment.responses)
+    
     # Write responses by group
     for group_name, questions in question_groups.items():
         output.write(f"QUESTION GROUP: {group_name.upper()}\n")
@@ -1185,11 +1477,13 @@ def admin_export_assessment_detailed(assessment_id):
             output.write(f"Responses:\n")
             
             for response in assessment.responses:
+                if response.id not in parsed_responses:
+                    continue  # Unreadable response data
                 try:
-                    response_data = json.loads(response.responses) if response.responses else {}
+                    response_data = parsed_responses[response.id]
                     
                     # Get participant information from the participant relationship
-                    participant = AssessmentParticipant.query.get(response.participant_id) if response.participant_id else None
+                    participant = participants.get(response.participant_id)
                     
                     if participant:
                         # For assessor responses, show assessor as participant and assessee in role
@@ -1204,27 +1498,17 @@ def admin_export_assessment_detailed(assessment_id):
                     answer = response_data.get(str(question.id), "No response")
                     
                     output.write(f"  - {participant_name}: {answer}\n")
-                except Exception as e:
-                    print(f"Error processing response: {e}")
+                except Exception:
+                    current_app.logger.exception("Error processing response %s", response.id)
                     continue
             
             output.write("\n")
         
         output.write("\n")
     
-    # Get assessee names for filename
-    assessees = []
-    for response in assessment.responses:
-        participant = AssessmentParticipant.query.get(response.participant_id) if response.participant_id else None
-        if participant and not participant.assessor_id:  # Self-assessment response (assessee)
-            assessee_name = participant.assessee.name.replace(" ", "_")
-            if assessee_name not in assessees:
-                assessees.append(assessee_name)
-    
     # Create filename with assessment and assessee names
-    assessee_part = "_".join(assessees) if assessees else "NoAssessee"
-    safe_title = assessment.title.replace(" ", "_").replace("/", "_").replace("\\", "_")
-    filename = f"assessment_{assessment_id}_{safe_title}_{assessee_part}_detailed_report.txt"
+    filename = export_filename(assessment, (participants.get(response.participant_id) for response in assessment.responses),
+                               'detailed_report.txt')
     
     # Create response
     output.seek(0)
@@ -1234,20 +1518,62 @@ def admin_export_assessment_detailed(assessment_id):
     
     return response
 
+def export_filename(assessment, response_participants, suffix):
+    """Export filename built from the assessment title and the assessees whose
+    self-assessment responses are included (participants are already loaded)"""
+    assessees = []
+    for participant in response_participants:
+        if participant and not participant.assessor_id:  # Self-assessment response (assessee)
+            assessee_name = participant.assessee.name.replace(" ", "_")
+            if assessee_name not in assessees:
+                assessees.append(assessee_name)
+    
+    assessee_part = "_".join(assessees) if assessees else "NoAssessee"
+    safe_title = assessment.title.replace(" ", "_").replace("/", "_").replace("\\", "_")
+    return f"assessment_{assessment.id}_{safe_title}_{assessee_part}_{suffix}"
+
+def load_participants_by_id(participant_ids):
+    """Load participants (with assessee and assessor) in one IN query, keyed by id"""
+    participant_ids = {pid for pid in participant_ids if pid}
+    if not participant_ids:
+        return {}
+    participants = AssessmentParticipant.query.options(
+        joinedload(AssessmentParticipant.assessee),
+        joinedload(AssessmentParticipant.assessor)
+    ).filter(AssessmentParticipant.id.in_(participant_ids)).all()
+    return {participant.id: participant for participant in participants}
+
+def parse_response_data(responses):
+    """Decode each response's JSON answers once, keyed by response id (unreadable ones are skipped)"""
+    parsed = {}
+    for response in responses:
+        try:
+            parsed[response.id] = orjson.loads(response.responses) if response.responses else {}
+        except Exception:
+            current_app.logger.exception("Error processing response %s", response.id)
+    return parsed
+
 # Assessment Analytics/Reports Page
 @admin_app.route('/assessments/<int:assessment_id>/reports')
 @admin_required
 def admin_assessment_reports(assessment_id):
-    assessment = Assessment.query.get_or_404(assessment_id)
-    
-    # Calculate analytics
-    total_participants = len(assessment.invitations)
+    # The response table shows each response's participant and both of its users
+    assessment = Assessment.query.options(
+        selectinload(Assessment.responses).selectinload(AssessmentResponse.participant).selectinload(AssessmentParticipant.assessee),
+        selectinload(Assessment.responses).selectinload(AssessmentResponse.participant).selectinload(AssessmentParticipant.assessor),
+        selectinload(Assessment.responses).selectinload(AssessmentResponse.user)
+    ).filter_by(id=assessment_id).first_or_404()
+    
+    # Calculate analytics - invitations are only counted, so COUNT them in SQL;
+    # the responses are loaded for the analysis anyway
+    total_participants = db.session.scalar(select(func.count(Invitation.id)).where(Invitation.assessment_id == assessment_id))
     completed_responses = len(assessment.responses)
     completion_rate = (completed_responses / total_participants * 100) if total_participants > 0 else 0
     
     # Group analysis by question groups
     question_groups = {}
     response_analysis = {}
+    parsed_responses = parse_response_data(assessment.responses)
     
     for question in assessment.questions:
         group = question.question_group or "General"
@@ -1258,9 +1584,8 @@ def admin_assessment_reports(assessment_id):
         
         # Analyze responses for this question
         responses_for_question = []
-        for response in assessment.responses:
+        for response_data in parsed_responses.values():
             try:
-                response_data = json.loads(response.responses) if response.responses else {}
                 answer = response_data.get(str(question.id))
                 if answer:
                     responses_for_question.append(answer)
@@ -1282,124 +1607,282 @@ def admin_assessment_reports(assessment_id):
                          response_analysis=response_analysis)
 
 # All Data View - New comprehensive data view
-@admin_app.route('/all-data')
-@admin_required
-def admin_all_data():
-    # Get all assessments with their responses
-    assessments = Assessment.query.order_by(Assessment.created_at.desc()).all()
+# Responses per page on the all-data view; each expands to one row per question
+ALL_DATA_PER_PAGE = 50
+
+ALL_DATA_CSV_HEADER = [
+    'Assessment ID', 'Assessment Title', 'Company', 'Participant Name',
+    'Participant Email', 'Participant Role', 'Assessee', 'Response Type',
+    'Question Group', 'Question Text', 'Question Type', 'Response', 'Submitted At'
+]
+
+def all_data_filters():
+    """The all-data filters set in the query string, as url_for() arguments"""
+    filters = {
+        'assessment_id': request.args.get('assessment_id', type=int),
+        'role': request.args.get('role', '').strip(),
+        'group': request.args.get('group', '').strip(),
+        'response': request.args.get('response', '').strip(),
+    }
+    return {key: value for key, value in filters.items() if value}
+
+def question_conditions(filters):
+    """SQL conditions on Question for the question group / type filters"""
+    conditions = []
+    group = filters.get('group')
+    if group == 'General':
+        # Rows show ungrouped questions as "General"
+        conditions.append(or_(Question.question_group.is_(None), Question.question_group.in_(['', 'General'])))
+    elif group:
+        conditions.append(Question.question_group == group)
+    if filters.get('response') in ('rating', 'text'):
+        conditions.append(Question.question_type == filters['response'])
+    return conditions
+
+def all_data_responses(filters=None):
+    """Responses in all-data order, with their assessment, company and user joined in"""
+    filters = filters or {}
+    query = AssessmentResponse.query.join(AssessmentResponse.assessment).options(
+        joinedload(AssessmentResponse.assessment).joinedload(Assessment.company_ref),
+        joinedload(AssessmentResponse.user)
+    )
     
-    # Collect all data
-    all_data = []
+    if 'assessment_id' in filters:
+        query = query.filter(AssessmentResponse.assessment_id == filters['assessment_id'])
     
-    for assessment in assessments:
-        for response in assessment.responses:
-            try:
-                response_data = json.loads(response.responses) if response.responses else {}
-                
-                # Get participant information
-                participant = AssessmentParticipant.query.get(response.participant_id) if response.participant_id else None
+    # Same role labels as build_all_data_rows gives participants
+    role = filters.get('role')
+    if role:
+        query = query.join(AssessmentParticipant, AssessmentResponse.participant_id == AssessmentParticipant.id)
+        if role == 'Self-Assessment':
+            query = query.filter(AssessmentParticipant.assessor_id.is_(None))
+        else:
+            query = query.filter(
+                AssessmentParticipant.assessor_id.isnot(None),
+                func.coalesce(func.nullif(AssessmentParticipant.assessor_relationship, ''), 'Assessor') == role
+            )
+    
+    # Skip responses whose assessment has no question the row filters would keep
+    conditions = question_conditions(filters)
+    if conditions:
+        query = query.filter(AssessmentResponse.assessment_id.in_(select(Question.assessment_id).where(*conditions)))
+    
+    return query.order_by(Assessment.created_at.desc(), AssessmentResponse.id)
+
+def load_question_keys(assessment_ids, conditions=()):
+    """Questions per assessment, each with the keys its answer may be stored under"""
+    question_keys = {}
+    if assessment_ids:
+        questions = Question.query.filter(Question.assessment_id.in_(assessment_ids), *conditions).order_by(Question.id)
+        for question in questions:
+            question_keys.setdefault(question.assessment_id, []).append(
+                (question, (str(question.id), f"question_{question.id}", f"q{question.id}")))
+    return question_keys
+
+def build_all_data_rows(responses, filters=None):
+    """Expand a batch of responses into one row per (filtered) assessment question"""
+    filters = filters or {}
+    participants = load_participants_by_id(r.participant_id for r in responses)
+    question_keys = load_question_keys({r.assessment_id for r in responses}, question_conditions(filters))
+    answer_filter = filters.get('response')
+    
+    for response in responses:
+        assessment = response.assessment
+        company_name = assessment.company_ref.name if assessment.company_ref else 'N/A'
+        
+        try:
+            response_data = orjson.loads(response.responses) if response.responses else {}
+            
+            # Get participant information
+            participant = participants.get(response.participant_id)
+            
+            if participant:
+                if participant.assessor_id:  # Assessor response
+                    participant_name = participant.assessor.name
+                    participant_email = participant.assessor.email
+                    participant_role = participant.assessor_relationship or "Assessor"
+                    assessee_name = participant.assessee.name
+                    response_type = "Assessor Evaluation"
+                else:  # Self-assessment response
+                    participant_name = participant.assessee.name
+                    participant_email = participant.assessee.email
+                    participant_role = "Self-Assessment"
+                    assessee_name = participant.assessee.name
+                    response_type = "Self-Assessment"
+            else:
+                # Fallback
+                participant_name = response.user.name if response.user else "Anonymous"
+                participant_email = response.user.email if response.user else "N/A"
+                participant_role = response.user.role if response.user else "N/A"
+                assessee_name = "Unknown"
+                response_type = "Unknown"
+            
+            for question, keys in question_keys.get(response.assessment_id, ()):
+                # Try multiple possible keys for the question response
+                raw_answer = ""
+                for key in keys:
+                    if key in response_data:
+                        raw_answer = response_data[key]
+                        break
                 
-                if participant:
-                    if participant.assessor_id:  # Assessor response
-                        participant_name = participant.assessor.name
-                        participant_email = participant.assessor.email
-                        participant_role = participant.assessor_relationship or "Assessor"
-                        assessee_name = participant.assessee.name
-                        response_type = "Assessor Evaluation"
-                    else:  # Self-assessment response
-                        participant_name = participant.assessee.name
-                        participant_email = participant.assessee.email
-                        participant_role = "Self-Assessment"
-                        assessee_name = participant.assessee.name
-                        response_type = "Self-Assessment"
+                if raw_answer and str(raw_answer).strip():
+                    answer = str(raw_answer).strip()
                 else:
-                    # Fallback
-                    participant_name = response.user.name if response.user else "Anonymous"
-                    participant_email = response.user.email if response.user else "N/A"
-                    participant_role = response.user.role if response.user else "N/A"
-                    assessee_name = "Unknown"
-                    response_type = "Unknown"
+                    answer = "No response"
                 
-                for question in assessment.questions:
-                    # Try multiple possible keys for the question response
-                    question_keys = [
-                        str(question.id),
-                        f"question_{question.id}",
-                        f"q{question.id}"
-                    ]
-                    
-                    raw_answer = ""
-                    for key in question_keys:
-                        if key in response_data:
-                            raw_answer = response_data[key]
-                            break
-                    
-                    if raw_answer and str(raw_answer).strip():
-                        answer = str(raw_answer).strip()
-                    else:
-                        answer = "No response"
-                    
-                    all_data.append({
-                        'assessment_id': assessment.id,
-                        'assessment_title': assessment.title,
-                        'assessment_created': assessment.created_at,
-                        'company_name': assessment.company_ref.name if assessment.company_ref else 'N/A',
-                        'participant_name': participant_name,
-                        'participant_email': participant_email,
-                        'participant_role': participant_role,
-                        'assessee_name': assessee_name,
-                        'response_type': response_type,
-                        'question_group': question.question_group or "General",
-                        'question_text': question.question_text,
-                        'question_type': question.question_type,
-                        'response': answer,
-                        'submitted_at': response.submitted_at
-                    })
-            except Exception as e:
-                print(f"Error processing response {response.id}: {e}")
-                continue
+                if answer_filter == 'has-response' and answer == "No response":
+                    continue
+                if answer_filter == 'no-response' and answer != "No response":
+                    continue
+                
+                yield {
+                    'assessment_id': assessment.id,
+                    'assessment_title': assessment.title,
+                    'assessment_created': assessment.created_at,
+                    'company_name': company_name,
+                    'participant_name': participant_name,
+                    'participant_email': participant_email,
+                    'participant_role': participant_role,
+                    'assessee_name': assessee_name,
+                    'response_type': response_type,
+                    'question_group': question.question_group or "General",
+                    'question_text': question.question_text,
+                    'question_type': question.question_type,
+                    'response': answer,
+                    'submitted_at': response.submitted_at
+                }
+        except Exception:
+            current_app.logger.exception("Error processing response %s", response.id)
+            continue
+
+# Five aggregate queries over the response/question tables - cached like the
+# report stats since the page is reloaded while paging and filtering
+@cache.memoize(timeout=60)
+def get_all_data_summary():
+    """Totals and per-assessment summary for the all-data page, computed in SQL"""
+    question_counts = count_by(Question.assessment_id)
+    response_counts = count_by(AssessmentResponse.assessment_id)
+    
+    # Who answered: the assessor, else the assessee, else the submitting user -
+    # counted as distinct (name, email) pairs, as the data rows show them
+    respondent = func.coalesce(AssessmentParticipant.assessor_id, AssessmentParticipant.assessee_id,
+                               AssessmentResponse.user_id)
+    respondents = db.session.execute(
+        select(AssessmentResponse.assessment_id, User.name, User.email)
+        .outerjoin(AssessmentParticipant, AssessmentResponse.participant_id == AssessmentParticipant.id)
+        .outerjoin(User, User.id == respondent)
+        .distinct()
+    ).all()
     
-    # Get summary statistics
-    total_assessments = len(assessments)
-    total_responses = len([data for data in all_data])
-    total_participants = len(set([(data['participant_name'], data['participant_email']) for data in all_data]))
-    total_companies = len(set([data['company_name'] for data in all_data if data['company_name'] != 'N/A']))
+    # Only assessments with questions produce data rows
+    participants = {}
+    for assessment_id, name, email in respondents:
+        if question_counts.get(assessment_id):
+            participants.setdefault(assessment_id, set()).add((name, email) if name else ("Anonymous", "N/A"))
+    
+    question_groups = {}
+    if participants:
+        for assessment_id, group in db.session.execute(
+            select(Question.assessment_id, Question.question_group)
+            .where(Question.assessment_id.in_(participants)).distinct()
+        ):
+            question_groups.setdefault(assessment_id, set()).add(group or "General")
+    
+    assessments = db.session.execute(
+        select(Assessment.id, Assessment.title, Assessment.created_at, Company.name.label('company'))
+        .outerjoin(Company, Assessment.company_id == Company.id)
+        .order_by(Assessment.created_at.desc())
+    ).all()
     
-    # Group by assessment for summary
     assessment_summary = {}
-    for data in all_data:
-        assessment_key = f"{data['assessment_id']}-{data['assessment_title']}"
-        if assessment_key not in assessment_summary:
-            assessment_summary[assessment_key] = {
-                'assessment': {
-                    'id': data['assessment_id'],
-                    'title': data['assessment_title'],
-                    'created': data['assessment_created'],
-                    'company': data['company_name']
-                },
-                'participants': set(),
-                'responses': 0,
-                'question_groups': set()
-            }
-        
-        assessment_summary[assessment_key]['participants'].add((data['participant_name'], data['participant_email']))
-        assessment_summary[assessment_key]['responses'] += 1
-        assessment_summary[assessment_key]['question_groups'].add(data['question_group'])
+    for assessment in assessments:
+        if assessment.id not in participants:
+            continue
+        assessment_summary[f"{assessment.id}-{assessment.title}"] = {
+            'assessment': {
+                'id': assessment.id,
+                'title': assessment.title,
+                'created': assessment.created_at,
+                'company': assessment.company or 'N/A'
+            },
+            'participants': participants[assessment.id],
+            'responses': response_counts[assessment.id] * question_counts[assessment.id],
+            'question_groups': question_groups.get(assessment.id, set())
+        }
+    
+    return {
+        'total_assessments': len(assessments),
+        'total_responses': sum(summary['responses'] for summary in assessment_summary.values()),
+        'total_participants': len(set().union(*participants.values())),
+        'total_companies': len({summary['assessment']['company'] for summary in assessment_summary.values()
+                                if summary['assessment']['company'] != 'N/A'}),
+        'assessment_summary': assessment_summary
+    }
+
+@admin_app.route('/all-data')
+@admin_required
+def admin_all_data():
+    # Only the current page of responses is expanded into rows; the summary
+    # figures cover everything and come straight from SQL
+    # Filters are applied in the query so they cover every page, not just this one
+    filters = all_data_filters()
+    page = request.args.get('page', 1, type=int)
+    responses = all_data_responses(filters).paginate(page=page, per_page=ALL_DATA_PER_PAGE, error_out=False)
+    all_data = list(build_all_data_rows(responses.items, filters))
+    
+    summary = get_all_data_summary()
+    question_groups = sorted(set().union(*(s['question_groups'] for s in summary['assessment_summary'].values())))
     
     return render_template('admin_all_data.html',
                          all_data=all_data,
-                         total_assessments=total_assessments,
-                         total_responses=total_responses,
-                         total_participants=total_participants,
-                         total_companies=total_companies,
-                         assessment_summary=assessment_summary)
+                         responses=responses,
+                         filters=filters,
+                         question_groups=question_groups,
+                         **summary)
+
+@admin_app.route('/all-data/export')
+@admin_required
+def admin_export_all_data():
+    """Stream every data row matching the page's filters as CSV, a batch of responses at a time"""
+    filters = all_data_filters()
+    
+    def generate():
+        output = io.StringIO()
+        writer = csv.writer(output)
+        
+        def flush():
+            data = output.getvalue()
+            output.seek(0)
+            output.truncate()
+            return data
+        
+        output.write('\ufeff')  # BOM for Excel compatibility
+        writer.writerow(ALL_DATA_CSV_HEADER)
+        yield flush()
+        
+        rows = iter(all_data_responses(filters).yield_per(500))
+        while responses := list(islice(rows, 500)):
+            for data in build_all_data_rows(responses, filters):
+                writer.writerow([
+                    data['assessment_id'], data['assessment_title'], data['company_name'],
+                    data['participant_name'], data['participant_email'], data['participant_role'],
+                    data['assessee_name'], data['response_type'], data['question_group'],
+                    data['question_text'], data['question_type'], data['response'],
+                    data['submitted_at'].strftime('%m/%d/%Y %H:%M') if data['submitted_at'] else ''
+                ])
+            yield flush()
+    
+    filename = f"Modern360_All_Assessment_Data_{datetime.utcnow().strftime('%Y-%m-%d')}.csv"
+    return csv_attachment(stream_with_context(generate()), filename)
 
 @admin_app.route('/invitations')
 @admin_required
 def admin_invitations():
     page = request.args.get('page', 1, type=int)
-    invitations = Invitation.query.order_by(Invitation.sent_at.desc()).paginate(
-        page=page, per_page=20, error_out=False)
+    invitations = Invitation.query.options(
+        joinedload(Invitation.assessment).load_only(Assessment.title),
+        joinedload(Invitation.sender).load_only(User.name)
+    ).order_by(Invitation.sent_at.desc()).paginate(page=page, per_page=20, error_out=False)
     return render_template('admin_invitations.html', invitations=invitations)
 
 @admin_app.route('/invitations/send', methods=['GET', 'POST'])
@@ -1413,55 +1896,58 @@ def admin_send_invitations():
         if not assessment_id or not emails:
             flash('Assessment and email addresses are required!', 'error')
             assessments = Assessment.query.filter_by(is_active=True).all()
-            users = User.query.filter_by(is_active=True).all()
+            users = active_users()
             return render_template('admin_send_invitations.html', assessments=assessments, users=users)
         
         assessment = Assessment.query.get(assessment_id)
         if not assessment:
             flash('Assessment not found!', 'error')
             assessments = Assessment.query.filter_by(is_active=True).all()
-            users = User.query.filter_by(is_active=True).all()
+            users = active_users()
             return render_template('admin_send_invitations.html', assessments=assessments, users=users)
         
         # Parse emails
         email_list = [email.strip().lower() for email in emails.replace(',', '\n').split('\n') if email.strip()]
         
-        sent_count = 0
-        for email in email_list:
-            # Check if invitation already exists
-            existing = Invitation.query.filter_by(assessment_id=assessment_id, email=email).first()
-            if existing:
-                continue
-            
-            # Create invitation
-            token = secrets.token_urlsafe(32)
-            invitation = Invitation(
-                assessment_id=assessment_id,
-                sender_id=sender_id or 1,
-                email=email,
-                token=token
-            )
-            db.session.add(invitation)
-            sent_count += 1
+        # Skip addresses that already have an invitation, in one query
+        existing = set(db.session.scalars(
+            select(Invitation.email).where(Invitation.assessment_id == assessment_id,
+                                           Invitation.email.in_(email_list))
+        ))
+        new_emails = [email for email in dict.fromkeys(email_list) if email not in existing]
+        
+        messages = []
+        invitation_rows = []
+        for email, token in zip(new_emails, generate_tokens(len(new_emails))):
+            invitation_rows.append({
+                'assessment_id': assessment_id,
+                'sender_id': sender_id or 1,
+                'email': email,
+                'token': token
+            })
             
-            # Send email (implement email sending here)
             try:
-                send_invitation_email(email, assessment, token)
-            except Exception as e:
-                print(f"Error sending email to {email}: {e}")
+                messages.append(build_invitation_message(email, assessment, token))
+            except Exception:
+                current_app.logger.exception("Error preparing invitation for %s", email)
         
+        if invitation_rows:
+            db.session.execute(Invitation.__table__.insert(), invitation_rows)
         db.session.commit()
-        flash(f'Sent {sent_count} invitations successfully!', 'success')
+        invalidate_admin_caches()
+        
+        queue_emails(messages)
+        flash(f'Queued {len(invitation_rows)} invitations for sending!', 'success')
         return redirect(url_for('admin_app.admin_invitations'))
     
     assessments = Assessment.query.filter_by(is_active=True).all()
-    users = User.query.filter_by(is_active=True).all()
+    users = active_users()
     return render_template('admin_send_invitations.html', assessments=assessments, users=users)
 
 @admin_app.route('/invitations/<int:invitation_id>/delete', methods=['POST'])
 @admin_required
 def admin_delete_invitation(invitation_id):
-    invitation = Invitation.query.get_or_404(invitation_id)
+    invitation = Invitation.query.options(joinedload(Invitation.assessment)).filter_by(id=invitation_id).first_or_404()
     
     # Check if invitation has already been responded to
     if invitation.is_completed:
@@ -1476,11 +1962,12 @@ def admin_delete_invitation(invitation_id):
         # Delete the invitation
         db.session.delete(invitation)
         db.session.commit()
+        invalidate_admin_caches()
         
         flash(f'Invitation for "{assessment_title}" sent to {recipient_email} has been deleted successfully!', 'success')
     except Exception as e:
         db.session.rollback()
-        print(f"Error deleting invitation: {e}")
+        current_app.logger.exception("Error deleting invitation %s", invitation_id)
         flash(f'Error deleting invitation: {str(e)}', 'error')
     
     return redirect(url_for('admin_app.admin_invitations'))
@@ -1494,75 +1981,64 @@ def admin_bulk_delete_invitations():
         return jsonify({'success': False, 'message': 'No invitations selected'})
     
     try:
-        deleted_count = 0
-        for invitation_id in invitation_ids:
-            invitation = Invitation.query.get(invitation_id)
-            if invitation and not invitation.is_completed:
-                db.session.delete(invitation)
-                deleted_count += 1
+        # One lookup shows which selected invitations are completed, so the
+        # response can report what was kept
+        completed = dict(db.session.execute(
+            select(Invitation.id, Invitation.is_completed).where(Invitation.id.in_(invitation_ids))
+        ).all())
+        skipped_ids = [invitation_id for invitation_id, is_completed in completed.items() if is_completed]
+        to_delete = [invitation_id for invitation_id, is_completed in completed.items() if not is_completed]
         
+        deleted_count = 0
+        if to_delete:
+            deleted_count = Invitation.query.filter(
+                Invitation.id.in_(to_delete),
+                Invitation.is_completed == False
+            ).delete(synchronize_session=False)
         db.session.commit()
+        invalidate_admin_caches()
         
+        message = f'Successfully deleted {deleted_count} invitation(s)'
+        if skipped_ids:
+            message += f', kept {len(skipped_ids)} already completed'
         return jsonify({
             'success': True, 
-            'message': f'Successfully deleted {deleted_count} invitation(s)',
-            'deleted_count': deleted_count
+            'message': message,
+            'deleted_count': deleted_count,
+            'skipped_ids': skipped_ids
         })
     except Exception as e:
         db.session.rollback()
-        print(f"Error bulk deleting invitations: {e}")
+        current_app.logger.exception("Error bulk deleting invitations")
         return jsonify({'success': False, 'message': f'Error deleting invitations: {str(e)}'})
 
 @admin_app.route('/reports')
 @admin_required
 def admin_reports():
-    # Assessment completion rates
-    assessments_with_stats = []
-    assessments = Assessment.query.all()
-    
-    for assessment in assessments:
-        total_invitations = len(assessment.invitations)
-        completed_responses = len(assessment.responses)
-        completion_rate = (completed_responses / total_invitations * 100) if total_invitations > 0 else 0
-        
-        assessments_with_stats.append({
-            'assessment': assessment,
-            'total_invitations': total_invitations,
-            'completed_responses': completed_responses,
-            'completion_rate': round(completion_rate, 1)
-        })
-    
-    # User activity stats
-    user_stats = []
-    users = User.query.all()
-    
-    for user in users:
-        assessments_created = len(user.created_assessments)
-        responses_submitted = len(user.responses)
-        invitations_sent = len(user.invitations_sent)
-        
-        user_stats.append({
-            'user': user,
-            'assessments_created': assessments_created,
-            'responses_submitted': responses_submitted,
-            'invitations_sent': invitations_sent
-        })
-    
-    return render_template('admin_reports.html', 
-                         assessments_with_stats=assessments_with_stats,
-                         user_stats=user_stats)
+    return render_template('admin_reports.html', **get_report_stats())
 
 @admin_app.route('/notifications')
 @admin_required
 def admin_notifications():
-    # Get pending invitations (notifications to send)
-    pending_invitations = Invitation.query.filter_by(is_completed=False).all()
-    
-    # Get overdue assessments
-    overdue_assessments = Assessment.query.filter(
-        Assessment.deadline < datetime.utcnow(),
-        Assessment.is_active == True
-    ).all()
+    # Get pending invitations (notifications to send), a page at a time
+    page = request.args.get('page', 1, type=int)
+    pending_invitations = Invitation.query.options(
+        joinedload(Invitation.assessment).joinedload(Assessment.creator)
+    ).filter_by(is_completed=False).order_by(Invitation.sent_at.desc()).paginate(
+        page=page, per_page=50, error_out=False)
+    
+    # Get overdue assessments, paged separately from the invitations
+    overdue_page = request.args.get('overdue_page', 1, type=int)
+    # The completion rate counts each assessment's responses and invitations
+    overdue_assessments = Assessment.query.options(
+        joinedload(Assessment.creator),
+        selectinload(Assessment.responses).load_only(AssessmentResponse.id),
+        selectinload(Assessment.invitations).load_only(Invitation.id)
+    ).filter(
+        Assessment.is_active == True,
+        Assessment.deadline < datetime.utcnow()
+    ).order_by(Assessment.deadline).paginate(
+        page=overdue_page, per_page=50, error_out=False)
     
     return render_template('admin_notifications.html',
                          pending_invitations=pending_invitations,
@@ -1571,18 +2047,89 @@ def admin_notifications():
 @admin_app.route('/send-reminder/<int:invitation_id>', methods=['POST'])
 @admin_required
 def send_reminder(invitation_id):
-    invitation = Invitation.query.get_or_404(invitation_id)
+    # The reminder shows the assessment title and company, so load them with the invitation
+    invitation = Invitation.query.options(
+        joinedload(Invitation.assessment).joinedload(Assessment.company_ref)
+    ).filter_by(id=invitation_id).first_or_404()
     
     try:
-        send_invitation_email(invitation.email, invitation.assessment, invitation.token, is_reminder=True)
-        flash(f'Reminder sent to {invitation.email}!', 'success')
+        queue_emails([build_invitation_message(invitation.email, invitation.assessment, invitation.token, is_reminder=True)])
+        flash(f'Reminder queued for {invitation.email}!', 'success')
     except Exception as e:
         flash(f'Failed to send reminder: {str(e)}', 'error')
     
     return redirect(url_for('admin_app.admin_notifications'))
 
+def queue_emails(messages):
+    """Hand prepared messages to the background mail workers, returns how many were queued"""
+    if messages:
+        email_executor.submit(_deliver_emails, current_app._get_current_object(), list(messages))
+    return len(messages)
+
+def _is_transient_smtp_error(error):
+    """Whether a send may succeed on retry - dropped connections and 4xx replies, not 5xx rejections"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code < 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code < 500
+    if isinstance(error, smtplib.SMTPServerDisconnected):
+        return True
+    # Remaining SMTPExceptions are protocol/config problems; other OSErrors are network failures
+    return isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)
+
+def _deliver_emails(app, messages, attempt=1):
+    """Send messages over a single SMTP connection, scheduling a retry of transient failures (runs in a background thread)"""
+    with app.app_context():
+        done = set()  # Sent, or failed permanently - either way not retried
+        try:
+            with mail.connect() as connection:
+                for msg in messages:
+                    try:
+                        connection.send(msg)
+                        done.add(id(msg))
+                    except Exception as e:
+                        if _is_transient_smtp_error(e):
+                            current_app.logger.warning("Temporary error sending email to %s: %s", ', '.join(msg.recipients), e)
+                        else:
+                            current_app.logger.exception("Dropping email to %s", ', '.join(msg.recipients))
+                            done.add(id(msg))
+        except Exception as e:
+            if not _is_transient_smtp_error(e):
+                current_app.logger.exception("Error connecting to mail server, dropping %d email(s)", len(messages) - len(done))
+                return
+            current_app.logger.warning("Temporary error connecting to mail server: %s", e)
+        
+        pending = [msg for msg in messages if id(msg) not in done]
+        if not pending:
+            return
+        if attempt >= EMAIL_MAX_ATTEMPTS:
+            current_app.logger.error("Giving up on %d email(s) after %d attempts", len(pending), EMAIL_MAX_ATTEMPTS)
+            return
+        
+        # Wait on a daemon timer rather than in the worker, so the worker is free
+        # for other mail and a pending retry doesn't hold up shutdown
+        retry = threading.Timer(EMAIL_RETRY_DELAY * attempt, _retry_emails, (app, pending, attempt + 1))
+        retry.daemon = True
+        retry.start()
+
+def _retry_emails(app, messages, attempt):
+    """Hand a retry batch back to the mail workers (runs on the retry timer)"""
+    try:
+        email_executor.submit(_deliver_emails, app, messages, attempt)
+    except RuntimeError:
+        # The executor is already shut down with the process
+        app.logger.warning("Mail workers stopped, dropping %d email(s) awaiting retry", len(messages))
+
 def send_self_assessment_invitation(email, assessment, token, assessee_name=None):
     """Send self-assessment invitation email"""
+    try:
+        mail.send(build_self_assessment_message(email, assessment, token, assessee_name))
+    except Exception as e:
+        current_app.logger.error("Error sending self-assessment email: %s", e)
+        raise
+
+def build_self_assessment_message(email, assessment, token, assessee_name=None):
+    """Build self-assessment invitation email"""
     try:
         msg = Message(
             subject=f'Complete Your Self-Assessment - {assessment.title}',
@@ -1590,74 +2137,26 @@ def send_self_assessment_invitation(email, assessment, token, assessee_name=None
         )
         
         # Create the invitation URL (pointing to main app)
-        main_app_url = os.environ.get('MAIN_APP_URL', 'https://asistentica.online')
-        invitation_url = f"{main_app_url}/respond/{token}"
+        invitation_url = f"{MAIN_APP_URL}/respond/{token}"
         
-        display_name = assessee_name or "yourself"
+        msg.html = render_template('admin_email_self_assessment.html', assessment=assessment,
+                                   invitation_url=invitation_url, assessee_name=assessee_name)
         
-        msg.html = f"""
-        <div style="font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; max-width: 600px; margin: 0 auto; background-color: #f8f9fa;">
-            <div style="background: linear-gradient(135deg, #1976d2 0%, #1565c0 100%); padding: 30px; text-align: center;">
-                <h1 style="color: white; margin: 0; font-size: 28px; font-weight: 300;">Modern360</h1>
-                <p style="color: white; margin: 10px 0 0 0; opacity: 0.9;">Assessment Platform</p>
-            </div>
-            
-            <div style="padding: 40px 30px; background-color: white;">
-                <h2 style="color: #333; margin-bottom: 20px; font-size: 24px; font-weight: 400;">Self-Assessment Invitation</h2>
-                
-                <p style="color: #666; font-size: 16px; line-height: 1.6; margin-bottom: 20px;">
-                    You have been invited to complete a self-assessment for <strong>{display_name}</strong>:
-                </p>
-                
-                <div style="background-color: #f8f9fa; padding: 20px; border-radius: 8px; margin: 20px 0; border-left: 4px solid #1976d2;">
-                    <h3 style="color: #1976d2; margin: 0; font-size: 18px; font-weight: 500;">{assessment.title}</h3>
-                    <p style="color: #666; margin: 10px 0 0 0; font-size: 14px;">Company: {assessment.company_ref.name if assessment.company_ref else 'N/A'}</p>
-                </div>
-                
-                <p style="color: #666; font-size: 16px; line-height: 1.6; margin-bottom: 20px;">
-                    {assessment.description or 'Please complete this self-assessment to evaluate your own performance and professional development.'}
-                </p>
-                
-                <p style="color: #666; font-size: 16px; line-height: 1.6; margin-bottom: 30px;">
-                    Click the button below to start your self-assessment:
-                </p>
-                
-                <div style="text-align: center; margin: 30px 0;">
-                    <a href="{invitation_url}" style="display: inline-block; background-color: #4caf50; color: white; padding: 14px 28px; text-decoration: none; border-radius: 6px; font-size: 16px; font-weight: 500;">Complete Self-Assessment</a>
-                </div>
-                
-                <div style="margin-top: 30px; padding: 15px; background-color: #e8f5e8; border-radius: 6px; border-left: 4px solid #4caf50;">
-                    <p style="color: #2e7d32; font-size: 14px; margin: 0;">
-                        <strong>Assessment Type:</strong> Self-Assessment<br>
-                        <strong>Your Role:</strong> Evaluate your own performance<br>
-                        <strong>Time Required:</strong> Approximately 10-15 minutes
-                    </p>
-                </div>
-                
-                <div style="margin-top: 20px; padding: 15px; background-color: #e7f3ff; border-radius: 6px; border-left: 4px solid #1976d2;">
-                    <p style="color: #0d47a1; font-size: 14px; margin: 0;">
-                        If the button doesn't work, copy and paste this link into your browser:<br>
-                        <span style="word-break: break-all; font-family: monospace;">{invitation_url}</span>
-                    </p>
-                </div>
-            </div>
-            
-            <div style="padding: 20px 30px; background-color: #f8f9fa; text-align: center; border-top: 1px solid #dee2e6;">
-                <p style="color: #6c757d; font-size: 12px; margin: 0;">
-                    This is an automated email from Modern360 Assessment Platform.<br>
-                    Your responses are confidential and will be used for professional development purposes only.
-                </p>
-            </div>
-        </div>
-        """
-        
-        mail.send(msg)
+        return msg
     except Exception as e:
-        print(f"Error sending self-assessment email: {e}")
+        current_app.logger.error("Error building self-assessment email: %s", e)
         raise
 
 def send_assessor_invitation(email, assessment, assessee_name, token, assessor_relationship=None):
     """Send assessor invitation email"""
+    try:
+        mail.send(build_assessor_message(email, assessment, assessee_name, token, assessor_relationship))
+    except Exception as e:
+        current_app.logger.error("Error sending assessor email: %s", e)
+        raise
+
+def build_assessor_message(email, assessment, assessee_name, token, assessor_relationship=None):
+    """Build assessor invitation email"""
     try:
         msg = Message(
             subject=f'Assess {assessee_name} - {assessment.title}',
@@ -1665,75 +2164,26 @@ def send_assessor_invitation(email, assessment, assessee_name, token, assessor_r
         )
         
         # Create the invitation URL (pointing to main app)
-        main_app_url = os.environ.get('MAIN_APP_URL', 'https://asistentica.online')
-        invitation_url = f"{main_app_url}/respond/{token}"
+        invitation_url = f"{MAIN_APP_URL}/respond/{token}"
         
-        relationship_text = f"as their {assessor_relationship}" if assessor_relationship else "as an assessor"
+        msg.html = render_template('admin_email_assessor.html', assessment=assessment, invitation_url=invitation_url,
+                                   assessee_name=assessee_name, assessor_relationship=assessor_relationship)
         
-        msg.html = f"""
-        <div style="font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; max-width: 600px; margin: 0 auto; background-color: #f8f9fa;">
-            <div style="background: linear-gradient(135deg, #1976d2 0%, #1565c0 100%); padding: 30px; text-align: center;">
-                <h1 style="color: white; margin: 0; font-size: 28px; font-weight: 300;">Modern360</h1>
-                <p style="color: white; margin: 10px 0 0 0; opacity: 0.9;">Assessment Platform</p>
-            </div>
-            
-            <div style="padding: 40px 30px; background-color: white;">
-                <h2 style="color: #333; margin-bottom: 20px; font-size: 24px; font-weight: 400;">Assessment Invitation</h2>
-                
-                <p style="color: #666; font-size: 16px; line-height: 1.6; margin-bottom: 20px;">
-                    You have been invited to assess <strong>{assessee_name}</strong> {relationship_text} in the following assessment:
-                </p>
-                
-                <div style="background-color: #f8f9fa; padding: 20px; border-radius: 8px; margin: 20px 0; border-left: 4px solid #1976d2;">
-                    <h3 style="color: #1976d2; margin: 0; font-size: 18px; font-weight: 500;">{assessment.title}</h3>
-                    <p style="color: #666; margin: 10px 0 0 0; font-size: 14px;">Company: {assessment.company_ref.name if assessment.company_ref else 'N/A'}</p>
-                </div>
-                
-                <p style="color: #666; font-size: 16px; line-height: 1.6; margin-bottom: 20px;">
-                    {assessment.description or 'Please complete this assessment to provide valuable feedback on the selected individual\'s performance.'}
-                </p>
-                
-                <p style="color: #666; font-size: 16px; line-height: 1.6; margin-bottom: 30px;">
-                    Click the button below to start the assessment:
-                </p>
-                
-                <div style="text-align: center; margin: 30px 0;">
-                    <a href="{invitation_url}" style="display: inline-block; background-color: #ff9800; color: white; padding: 14px 28px; text-decoration: none; border-radius: 6px; font-size: 16px; font-weight: 500;">Start Assessment</a>
-                </div>
-                
-                <div style="margin-top: 30px; padding: 15px; background-color: #fff3e0; border-radius: 6px; border-left: 4px solid #ff9800;">
-                    <p style="color: #e65100; font-size: 14px; margin: 0;">
-                        <strong>Assessment Details:</strong><br>
-                        <strong>Assessing:</strong> {assessee_name}<br>
-                        <strong>Your Role:</strong> {assessor_relationship or 'Assessor'}<br>
-                        <strong>Time Required:</strong> Approximately 10-15 minutes
-                    </p>
-                </div>
-                
-                <div style="margin-top: 20px; padding: 15px; background-color: #e7f3ff; border-radius: 6px; border-left: 4px solid #1976d2;">
-                    <p style="color: #0d47a1; font-size: 14px; margin: 0;">
-                        If the button doesn't work, copy and paste this link into your browser:<br>
-                        <span style="word-break: break-all; font-family: monospace;">{invitation_url}</span>
-                    </p>
-                </div>
-            </div>
-            
-            <div style="padding: 20px 30px; background-color: #f8f9fa; text-align: center; border-top: 1px solid #dee2e6;">
-                <p style="color: #6c757d; font-size: 12px; margin: 0;">
-                    This is an automated email from Modern360 Assessment Platform.<br>
-                    Your feedback is valuable and will help in professional development.
-                </p>
-            </div>
-        </div>
-        """
-        
-        mail.send(msg)
+        return msg
     except Exception as e:
-        print(f"Error sending assessor email: {e}")
+        current_app.logger.error("Error building assessor email: %s", e)
         raise
 
 def send_invitation_email(email, assessment, token, is_reminder=False):
     """Send invitation email"""
+    try:
+        mail.send(build_invitation_message(email, assessment, token, is_reminder))
+    except Exception as e:
+        current_app.logger.error("Error sending invitation email: %s", e)
+        raise
+
+def build_invitation_message(email, assessment, token, is_reminder=False):
+    """Build invitation email"""
     try:
         msg = Message(
             subject=f"{'Reminder: ' if is_reminder else ''}Assessment Invitation - {assessment.title}",
@@ -1741,69 +2191,14 @@ def send_invitation_email(email, assessment, token, is_reminder=False):
         )
         
         # Create the invitation URL (pointing to main app)
-        main_app_url = os.environ.get('MAIN_APP_URL', 'https://asistentica.online')
-        invitation_url = f"{main_app_url}/respond/{token}"
-        
-        msg.html = f"""
-        <div style="font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; max-width: 600px; margin: 0 auto; background-color: #f8f9fa;">
-            <div style="background: linear-gradient(135deg, #1976d2 0%, #1565c0 100%); padding: 30px; text-align: center;">
-                <h1 style="color: white; margin: 0; font-size: 28px; font-weight: 300;">Modern360</h1>
-                <p style="color: white; margin: 10px 0 0 0; opacity: 0.9;">Assessment Platform</p>
-            </div>
-            
-            <div style="padding: 40px 30px; background-color: white;">
-                <h2 style="color: #333; margin-bottom: 20px; font-size: 24px; font-weight: 400;">
-                    {'Assessment Reminder' if is_reminder else 'Assessment Invitation'}
-                </h2>
-                
-                <p style="color: #666; font-size: 16px; line-height: 1.6; margin-bottom: 20px;">
-                    {'This is a reminder that you have' if is_reminder else 'You have'} been invited to complete the assessment:
-                </p>
-                
-                <div style="background-color: #f8f9fa; padding: 20px; border-radius: 8px; margin: 20px 0; border-left: 4px solid #1976d2;">
-                    <h3 style="color: #1976d2; margin: 0; font-size: 18px; font-weight: 500;">{assessment.title}</h3>
-                    <p style="color: #666; margin: 10px 0 0 0; font-size: 14px;">Company: {assessment.company_ref.name if hasattr(assessment, 'company_ref') and assessment.company_ref else 'N/A'}</p>
-                </div>
-                
-                <p style="color: #666; font-size: 16px; line-height: 1.6; margin-bottom: 20px;">
-                    {assessment.description or 'Please complete this assessment.'}
-                </p>
-                
-                <p style="color: #666; font-size: 16px; line-height: 1.6; margin-bottom: 30px;">
-                    Click the button below to start the assessment:
-                </p>
-                
-                <div style="text-align: center; margin: 30px 0;">
-                    <a href="{invitation_url}" style="display: inline-block; background-color: {'#f44336' if is_reminder else '#1976d2'}; color: white; padding: 14px 28px; text-decoration: none; border-radius: 6px; font-size: 16px; font-weight: 500;">
-                        {'Complete Assessment Now' if is_reminder else 'Start Assessment'}
-                    </a>
-                </div>
-                
-                <div style="margin-top: 30px; padding: 15px; background-color: {'#ffebee' if is_reminder else '#e7f3ff'}; border-radius: 6px; border-left: 4px solid {'#f44336' if is_reminder else '#1976d2'};">
-                    <p style="color: {'#c62828' if is_reminder else '#0d47a1'}; font-size: 14px; margin: 0;">
-                        {'Please complete this assessment as soon as possible.' if is_reminder else 'Thank you for your participation.'}
-                    </p>
-                </div>
-                
-                <div style="margin-top: 20px; padding: 15px; background-color: #e7f3ff; border-radius: 6px; border-left: 4px solid #1976d2;">
-                    <p style="color: #0d47a1; font-size: 14px; margin: 0;">
-                        If the button doesn't work, copy and paste this link into your browser:<br>
-                        <span style="word-break: break-all; font-family: monospace;">{invitation_url}</span>
-                    </p>
-                </div>
-            </div>
-            
-            <div style="padding: 20px 30px; background-color: #f8f9fa; text-align: center; border-top: 1px solid #dee2e6;">
-                <p style="color: #6c757d; font-size: 12px; margin: 0;">
-                    This is an automated email from Modern360 Assessment Platform.
-                </p>
-            </div>
-        </div>
-        """
-        
-        mail.send(msg)
+        invitation_url = f"{MAIN_APP_URL}/respond/{token}"
+        
+        msg.html = render_template('admin_email_invitation.html', assessment=assessment,
+                                   invitation_url=invitation_url, is_reminder=is_reminder)
+        
+        return msg
     except Exception as e:
-        print(f"Error sending invitation email: {e}")
+        current_app.logger.error("Error building invitation email: %s", e)
         raise
 
 @admin_app.route('/favicon.ico')
@@ -1814,11 +2209,16 @@ def favicon():
     
     try:
         # Try to serve the favicon from the static folder
-        return send_from_directory(
+        response = send_from_directory(
             os.path.join(current_app.root_path, 'static'),
             'favicon.ico',
-            mimetype='image/vnd.microsoft.icon'
+            mimetype='image/vnd.microsoft.icon',
+            max_age=31536000
         )
+        # Browsers ask for the favicon on every page, let them keep it for a year
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
     except FileNotFoundError:
         # If favicon doesn't exist, return a 204 No Content response
         from flask import make_response
@@ -1,4 +1,5 @@
 from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify, g
+from flask.logging import default_handler
 from flask_mail import Mail, Message
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
@@ -9,15 +10,41 @@ from werkzeug.security import generate_password_hash, check_password_hash
 import uuid
 import random
 import string
-import json
+import orjson
 import base64
 from dotenv import load_dotenv
 from functools import wraps
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+import atexit
+import logging
+import queue
 
 # Load environment variables from .env file
 load_dotenv()
 
 app = Flask(__name__)
+
+# Logging - records are handed to a background listener so request threads
+# never block on stderr; LOG_LEVEL=DEBUG turns on debug output
+log_queue = queue.SimpleQueue()
+log_handlers = [default_handler]
+if os.environ.get('LOG_FILE'):
+    # Optional rotating file for hosts without log aggregation
+    file_handler = RotatingFileHandler(os.environ['LOG_FILE'], maxBytes=10 * 1024 * 1024, backupCount=5)
+    file_handler.setFormatter(default_handler.formatter)
+    log_handlers.append(file_handler)
+log_listener = QueueListener(log_queue, *log_handlers)
+app.logger.removeHandler(default_handler)
+app.logger.addHandler(QueueHandler(log_queue))
+log_level = os.environ.get('LOG_LEVEL', 'INFO').upper()
+level_known = isinstance(logging.getLevelName(log_level), int)
+app.logger.setLevel(log_level if level_known else logging.INFO)
+log_listener.start()
+atexit.register(log_listener.stop)
+if not level_known:
+    # A typo in LOG_LEVEL shouldn't keep the app from starting
+    app.logger.warning("Unknown LOG_LEVEL %r, using INFO", log_level)
+
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
 
 # Database configuration
@@ -27,6 +54,20 @@ if database_url and database_url.startswith('postgres://'):
     database_url = database_url.replace('postgres://', 'postgresql://', 1)
 app.config['SQLALCHEMY_DATABASE_URI'] = database_url
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Connection pool - sized per worker process; pre-ping drops connections the
+# server closed while idle instead of failing the next request
+# Compiled statements are cached per engine; the default of 500 entries is
+# easily churned by the admin's many filter/eager-load variants
+engine_options = {'pool_pre_ping': True, 'query_cache_size': 1200}
+if not database_url.startswith('sqlite'):
+    engine_options.update(
+        pool_size=int(os.environ.get('DB_POOL_SIZE', 10)),
+        max_overflow=int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+        pool_timeout=30,
+        pool_recycle=1800,
+        pool_use_lifo=True,  # Reuse the most recent connection; idle extras age out via pool_recycle
+    )
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options
 
 # Mail configuration
 app.config['MAIL_SERVER'] = os.environ.get('MAIL_SERVER', 'smtp.gmail.com')
@@ -43,6 +84,15 @@ app.config['MAIL_USERNAME'] = os.environ.get('MAIL_USERNAME')
 app.config['MAIL_PASSWORD'] = os.environ.get('MAIL_PASSWORD')
 app.config['MAIL_DEFAULT_SENDER'] = os.environ.get('MAIL_DEFAULT_SENDER')
 
+# Cache configuration - shared Redis cache when available, otherwise per-process memory
+redis_url = os.environ.get('REDIS_URL')
+if redis_url:
+    app.config['CACHE_TYPE'] = 'RedisCache'
+    app.config['CACHE_REDIS_URL'] = redis_url
+else:
+    app.config['CACHE_TYPE'] = 'SimpleCache'
+app.config['CACHE_DEFAULT_TIMEOUT'] = 60
+
 # Initialize extensions
 db = SQLAlchemy(app)
 migrate = Migrate(app, db)
@@ -97,6 +147,10 @@ class Company(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     is_active = db.Column(db.Boolean, default=True)
     
+    __table_args__ = (
+        db.Index('ix_company_created_at', 'created_at', 'id'),  # Newest-first listing
+    )
+    
     # Relationships
     users = db.relationship('User', backref='company_ref', lazy=True)
     assessments = db.relationship('Assessment', backref='company_ref', lazy=True)
@@ -105,13 +159,16 @@ class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(120), unique=True, nullable=False)
     name = db.Column(db.String(100), nullable=False)
-    company = db.Column(db.String(150), nullable=True)  # Legacy field
-    company_id = db.Column(db.Integer, db.ForeignKey('company.id'), nullable=True)  # New company reference
+    company_id = db.Column(db.Integer, db.ForeignKey('company.id'), nullable=True)
     role = db.Column(db.String(20), default='user')  # admin, manager, user, assessee, assessor
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     is_active = db.Column(db.Boolean, default=True)
     last_login = db.Column(db.DateTime)
     
+    __table_args__ = (
+        db.Index('ix_user_company_created', 'company_id', 'created_at', 'id'),  # Per-company listing
+    )
+    
     # Relationships
     created_assessments = db.relationship('Assessment', backref='creator', lazy=True)
     invitations_sent = db.relationship('Invitation', backref='sender', lazy=True)
@@ -139,6 +196,12 @@ class Assessment(db.Model):
     is_active = db.Column(db.Boolean, default=True)
     is_self_assessment = db.Column(db.Boolean, default=False)  # New field for self-assessment
     
+    __table_args__ = (
+        db.Index('ix_assessment_company_created', 'company_id', 'created_at', 'id'),  # Per-company listing
+        db.Index('ix_assessment_creator_active', 'creator_id', 'is_active'),  # User deletion checks
+        db.Index('ix_assessment_active_deadline', 'is_active', 'deadline'),  # Overdue notifications
+    )
+    
     # Relationships
     invitations = db.relationship('Invitation', backref='assessment', lazy=True)
     responses = db.relationship('AssessmentResponse', backref='assessment', lazy=True)
@@ -153,6 +216,10 @@ class Question(db.Model):
     language = db.Column(db.String(10), default='en')  # Language code (en, bs, etc.)
     options = db.Column(db.Text)  # JSON string for multiple choice options
     order = db.Column(db.Integer, default=0)
+    
+    __table_args__ = (
+        db.Index('ix_question_assessment_lang_order', 'assessment_id', 'language', 'order'),  # Template lookups use assessment_id=0
+    )
 
 class Invitation(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -163,6 +230,12 @@ class Invitation(db.Model):
     sent_at = db.Column(db.DateTime, default=datetime.utcnow)
     responded_at = db.Column(db.DateTime)
     is_completed = db.Column(db.Boolean, default=False)
+    
+    __table_args__ = (
+        db.Index('ix_invitation_email_completed', 'email', 'is_completed'),
+        db.Index('ix_invitation_assessment_email_completed', 'assessment_id', 'email', 'is_completed'),
+        db.Index('ix_invitation_completed_sent', 'is_completed', 'sent_at'),  # Pending count and notifications
+    )
 
 class AssessmentParticipant(db.Model):
     """Link between Assessment, Assessee, and Assessors"""
@@ -179,6 +252,12 @@ class AssessmentParticipant(db.Model):
     self_assessment_date = db.Column(db.DateTime)
     assessor_assessment_date = db.Column(db.DateTime)
     
+    __table_args__ = (
+        db.Index('ix_participant_assessment_assessee_assessor', 'assessment_id', 'assessee_id', 'assessor_id'),
+        db.Index('ix_participant_assessee_assessment', 'assessee_id', 'assessment_id'),  # User deletion checks
+        db.Index('ix_participant_assessor_assessment', 'assessor_id', 'assessment_id'),
+    )
+    
     # Relationships
     assessee = db.relationship('User', foreign_keys=[assessee_id], backref='assessee_participations')
     assessor = db.relationship('User', foreign_keys=[assessor_id], backref='assessor_participations')
@@ -193,6 +272,13 @@ class AssessmentResponse(db.Model):
     responses = db.Column(db.Text)  # JSON string of responses
     response_type = db.Column(db.String(20), default='assessor')  # 'self' or 'assessor'
     submitted_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_response_assessment', 'assessment_id'),
+    )
+    
+    # Relationships
+    participant = db.relationship('AssessmentParticipant')
 
 # Domain redirect configuration
 @app.before_request
@@ -305,7 +391,8 @@ def verify_code(token):
     
     # Get or create user
     user = verification.user
-    if not user:
+    user_created = not user
+    if user_created:
         # Create new user
         user = User(
             email=verification.email,
@@ -317,13 +404,15 @@ def verify_code(token):
     # Update last login
     user.last_login = datetime.utcnow()
     db.session.commit()
+    if user_created:
+        invalidate_admin_caches()
     
     # Create session
     session['user'] = {
         'id': user.id,
         'email': user.email,
         'name': user.name,
-        'company': user.company,
+        'company': user.company_ref.name if user.company_ref else None,
         'role': user.role
     }
     
@@ -348,7 +437,8 @@ def direct_login(token):
     
     # Get or create user
     user = verification.user
-    if not user:
+    user_created = not user
+    if user_created:
         # Create new user
         user = User(
             email=verification.email,
@@ -360,13 +450,15 @@ def direct_login(token):
     # Update last login
     user.last_login = datetime.utcnow()
     db.session.commit()
+    if user_created:
+        invalidate_admin_caches()
     
     # Create session
     session['user'] = {
         'id': user.id,
         'email': user.email,
         'name': user.name,
-        'company': user.company,
+        'company': user.company_ref.name if user.company_ref else None,
         'role': user.role
     }
     
@@ -400,11 +492,12 @@ def create_assessment():
             title=request.form['title'],
             description=request.form['description'],
             creator_id=session['user']['id'],
-            deadline=datetime.strptime(request.form['deadline'], '%Y-%m-%d') if request.form['deadline'] else None,
+            deadline=datetime.fromisoformat(request.form['deadline']) if request.form['deadline'] else None,
             is_self_assessment=is_self_assessment
         )
         db.session.add(assessment)
         db.session.commit()
+        invalidate_admin_caches()
         
         if is_self_assessment:
             flash('Self-assessment created successfully! You can now complete it yourself.', 'success')
@@ -442,11 +535,13 @@ def invite_users(id):
         emails = request.form['emails'].split(',')
         emails = [email.strip() for email in emails if email.strip()]
         
+        messages = []
+        tokens = iter(generate_tokens(len(emails)))
         for email in emails:
             # Check if invitation already exists
             existing = Invitation.query.filter_by(assessment_id=id, email=email).first()
             if not existing:
-                token = secrets.token_urlsafe(32)
+                token = next(tokens)
                 invitation = Invitation(
                     assessment_id=id,
                     sender_id=session['user']['id'],
@@ -455,10 +550,14 @@ def invite_users(id):
                 )
                 db.session.add(invitation)
                 
-                # Send email
-                send_invitation_email(email, assessment.title, token)
+                message = build_invitation_message(email, assessment.title, token)
+                if message:
+                    messages.append(message)
         
         db.session.commit()
+        invalidate_admin_caches()
+        # Emails go out in the background once the invitations are committed
+        queue_emails(messages)
         flash(f'Invitations sent to {len(emails)} recipients!', 'success')
         return redirect(url_for('assessment_details', id=id))
     
@@ -556,7 +655,7 @@ def submit_assessment(token):
             assessment_id=invitation.assessment_id,
             invitation_id=invitation.id,
             participant_id=participant_id,
-            responses=json.dumps(responses),
+            responses=orjson.dumps(responses).decode('utf-8'),
             response_type=response_type
         )
         
@@ -577,6 +676,7 @@ def submit_assessment(token):
         
         db.session.add(response)
         db.session.commit()
+        invalidate_admin_caches()
         
         return jsonify({'success': True, 'message': 'Assessment submitted successfully'})
         
@@ -641,6 +741,7 @@ def submit_self_assessment(id):
     
     db.session.add(response)
     db.session.commit()
+    invalidate_admin_caches()
     
     return jsonify({'success': True})
 
@@ -655,60 +756,24 @@ def send_verification_email(email, verification_code, login_token):
         direct_login_url = url_for('direct_login', token=login_token, _external=True)
         verify_url = url_for('verify_email', token=login_token, _external=True)
         
-        msg.html = f"""
-        <div style="font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; max-width: 600px; margin: 0 auto; background-color: #f8f9fa;">
-            <div style="background: linear-gradient(135deg, #1976d2 0%, #1565c0 100%); padding: 30px; text-align: center;">
-                <h1 style="color: white; margin: 0; font-size: 28px; font-weight: 300;">Modern360</h1>
-                <p style="color: white; margin: 10px 0 0 0; opacity: 0.9;">Assessment Platform</p>
-            </div>
-            
-            <div style="padding: 40px 30px; background-color: white;">
-                <h2 style="color: #333; margin-bottom: 20px; font-size: 24px; font-weight: 400;">Your Login Code</h2>
-                
-                <p style="color: #666; font-size: 16px; line-height: 1.6; margin-bottom: 30px;">
-                    Use this verification code to log in to your Modern360 account:
-                </p>
-                
-                <div style="text-align: center; margin: 30px 0;">
-                    <div style="display: inline-block; background-color: #f5f5f5; padding: 20px 30px; border-radius: 8px; border: 2px dashed #1976d2;">
-                        <span style="font-size: 32px; font-weight: bold; color: #1976d2; letter-spacing: 4px; font-family: 'Courier New', monospace;">{verification_code}</span>
-                    </div>
-                </div>
-                
-                <div style="text-align: center; margin: 30px 0;">
-                    <a href="{verify_url}" style="display: inline-block; background-color: #1976d2; color: white; padding: 14px 28px; text-decoration: none; border-radius: 6px; font-size: 16px; font-weight: 500;">Enter Code</a>
-                </div>
-                
-                <div style="border-top: 1px solid #eee; margin: 30px 0; padding-top: 20px;">
-                    <p style="color: #666; font-size: 14px; margin-bottom: 15px;">
-                        <strong>Quick Login:</strong> Click the button below to log in instantly without entering the code:
-                    </p>
-                    <div style="text-align: center;">
-                        <a href="{direct_login_url}" style="display: inline-block; background-color: #4caf50; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; font-size: 14px;">Login Instantly</a>
-                    </div>
-                </div>
-                
-                <div style="margin-top: 30px; padding: 15px; background-color: #fff3cd; border-radius: 6px; border-left: 4px solid #ffc107;">
-                    <p style="color: #856404; font-size: 14px; margin: 0;">
-                        <strong>Security Note:</strong> This code expires in 15 minutes. If you didn't request this login, please ignore this email.
-                    </p>
-                </div>
-            </div>
-            
-            <div style="padding: 20px 30px; background-color: #f8f9fa; text-align: center; border-top: 1px solid #dee2e6;">
-                <p style="color: #6c757d; font-size: 12px; margin: 0;">
-                    This is an automated email from Modern360 Assessment Platform.
-                </p>
-            </div>
-        </div>
-        """
+        msg.html = render_template('email_verification.html', verification_code=verification_code,
+                                   verify_url=verify_url, direct_login_url=direct_login_url)
         
         mail.send(msg)
-    except Exception as e:
-        print(f"Error sending verification email: {e}")
+    except Exception:
+        app.logger.exception("Error sending verification email to %s", email)
 
 def send_invitation_email(email, assessment_title, token):
     """Send invitation email to user"""
+    message = build_invitation_message(email, assessment_title, token)
+    if message:
+        try:
+            mail.send(message)
+        except Exception:
+            app.logger.exception("Error sending invitation email to %s", email)
+
+def build_invitation_message(email, assessment_title, token):
+    """Build invitation email for user, None if it could not be built"""
     try:
         msg = Message(
             subject=f'You have been invited to complete: {assessment_title}',
@@ -717,51 +782,13 @@ def send_invitation_email(email, assessment_title, token):
         
         invitation_url = url_for('respond_to_assessment', token=token, _external=True)
         
-        msg.html = f"""
-        <div style="font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; max-width: 600px; margin: 0 auto; background-color: #f8f9fa;">
-            <div style="background: linear-gradient(135deg, #1976d2 0%, #1565c0 100%); padding: 30px; text-align: center;">
-                <h1 style="color: white; margin: 0; font-size: 28px; font-weight: 300;">Modern360</h1>
-                <p style="color: white; margin: 10px 0 0 0; opacity: 0.9;">Assessment Platform</p>
-            </div>
-            
-            <div style="padding: 40px 30px; background-color: white;">
-                <h2 style="color: #333; margin-bottom: 20px; font-size: 24px; font-weight: 400;">Assessment Invitation</h2>
-                
-                <p style="color: #666; font-size: 16px; line-height: 1.6; margin-bottom: 20px;">
-                    You have been invited to complete the assessment:
-                </p>
-                
-                <div style="background-color: #f8f9fa; padding: 20px; border-radius: 8px; margin: 20px 0; border-left: 4px solid #1976d2;">
-                    <h3 style="color: #1976d2; margin: 0; font-size: 18px; font-weight: 500;">{assessment_title}</h3>
-                </div>
-                
-                <p style="color: #666; font-size: 16px; line-height: 1.6; margin-bottom: 30px;">
-                    Click the button below to start the assessment:
-                </p>
-                
-                <div style="text-align: center; margin: 30px 0;">
-                    <a href="{invitation_url}" style="display: inline-block; background-color: #1976d2; color: white; padding: 14px 28px; text-decoration: none; border-radius: 6px; font-size: 16px; font-weight: 500;">Start Assessment</a>
-                </div>
-                
-                <div style="margin-top: 30px; padding: 15px; background-color: #e7f3ff; border-radius: 6px; border-left: 4px solid #1976d2;">
-                    <p style="color: #0d47a1; font-size: 14px; margin: 0;">
-                        If the button doesn't work, copy and paste this link into your browser:<br>
-                        <span style="word-break: break-all; font-family: monospace;">{invitation_url}</span>
-                    </p>
-                </div>
-            </div>
-            
-            <div style="padding: 20px 30px; background-color: #f8f9fa; text-align: center; border-top: 1px solid #dee2e6;">
-                <p style="color: #6c757d; font-size: 12px; margin: 0;">
-                    This is an automated email from Modern360 Assessment Platform.
-                </p>
-            </div>
-        </div>
-        """
+        msg.html = render_template('email_invitation.html', assessment_title=assessment_title,
+                                   invitation_url=invitation_url)
         
-        mail.send(msg)
-    except Exception as e:
-        print(f"Error sending email: {e}")
+        return msg
+    except Exception:
+        app.logger.exception("Error building invitation email for %s", email)
+        return None
 
 @app.route('/metrics')
 def metrics():
@@ -809,11 +836,16 @@ def favicon():
     
     try:
         # Try to serve the favicon from the static folder
-        return send_from_directory(
+        response = send_from_directory(
             os.path.join(app.root_path, 'static'),
             'favicon.ico',
-            mimetype='image/vnd.microsoft.icon'
+            mimetype='image/vnd.microsoft.icon',
+            max_age=31536000
         )
+        # Browsers ask for the favicon on every page, let them keep it for a year
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
     except FileNotFoundError:
         # If favicon doesn't exist, return a 204 No Content response
         from flask import make_response
@@ -858,7 +890,7 @@ def datetime_filter(dt):
     return ''
 
 # Import and register admin blueprint
-from admin_app import admin_app, init_admin_app
+from admin_app import admin_app, init_admin_app, invalidate_admin_caches, queue_emails, generate_tokens
 
 # Initialize admin app with dependencies
 models = {
@@ -868,7 +900,8 @@ models = {
     'AssessmentParticipant': AssessmentParticipant,
     'Question': Question,
     'Invitation': Invitation,
-    'AssessmentResponse': AssessmentResponse
+    'AssessmentResponse': AssessmentResponse,
+    'EmailVerification': EmailVerification
 }
 init_admin_app(app, db, mail, models)
 